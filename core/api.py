@@ -0,0 +1,97 @@
+from functools import wraps
+
+from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.gzip import gzip_page
+from django.views.decorators.http import require_GET
+
+API_DEFAULT_LIMIT = 100
+API_MAX_LIMIT = 500
+API_MAX_INT = 2**63 - 1
+
+
+class ApiError(Exception):
+    pass
+
+
+def api_view(view):
+    # Salt okunur JSON uclari: oturum yoksa login'e yonlendirmek yerine 401, hatali parametrede 400.
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse({"error": "authentication required"}, status=401)
+        try:
+            return view(request, *args, **kwargs)
+        except ApiError as exc:
+            return JsonResponse({"error": str(exc)}, status=400)
+
+    return require_GET(gzip_page(wrapper))
+
+
+def _int_param(request, name, default):
+    raw = request.GET.get(name)
+    if raw in (None, ""):
+        return default
+    # isdigit() "²" gibi karakterleri de kabul eder; int() ile dogrulanir.
+    # Ust sinir SQLite INTEGER araligi; asarsa sorgu OverflowError verirdi.
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ApiError(f"{name} must be a non-negative integer") from None
+    if not 0 <= value <= API_MAX_INT:
+        raise ApiError(f"{name} must be a non-negative integer")
+    return value
+
+
+def _selected_fields(request, fields, default_fields):
+    raw = request.GET.get("fields")
+    if not raw:
+        names = list(default_fields)
+    else:
+        names = [name.strip() for name in raw.split(",") if name.strip()]
+        unknown = [name for name in names if name not in fields]
+        if unknown:
+            raise ApiError(f"unknown fields: {', '.join(unknown)}")
+    # Cursor icin id her zaman doner.
+    if "id" not in names:
+        names.insert(0, "id")
+    return list(dict.fromkeys(names))
+
+
+def _updated_since(request):
+    raw = request.GET.get("updated_since")
+    if not raw:
+        return None
+    value = parse_datetime(raw)
+    if value is None:
+        raise ApiError("updated_since must be an ISO 8601 datetime")
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
+
+
+def values_page(request, queryset, fields, default_fields, updated_field):
+    # fields: API adi -> ORM lookup. Satirlar .values() ile gelir, model nesnesi olusturulmaz;
+    # sayfalama id uzerinden keyset, next_cursor bir sonraki istekte cursor olarak gonderilir.
+    names = _selected_fields(request, fields, default_fields)
+    cursor = _int_param(request, "cursor", 0)
+    limit = min(max(_int_param(request, "limit", API_DEFAULT_LIMIT), 1), API_MAX_LIMIT)
+    since = _updated_since(request)
+
+    queryset = queryset.filter(id__gt=cursor)
+    if since is not None:
+        queryset = queryset.filter(**{f"{updated_field}__gte": since})
+    lookups = [fields[name] for name in names]
+    rows = list(queryset.order_by("id").values(*lookups)[: limit + 1])
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = rows[-1]["id"]
+    renamed = [(lookup, name) for name, lookup in zip(names, lookups) if lookup != name]
+    if renamed:
+        for row in rows:
+            for lookup, name in renamed:
+                row[name] = row.pop(lookup)
+    return JsonResponse({"results": rows, "next_cursor": next_cursor})
@@ -0,0 +1,228 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS cache_entries (
+        key TEXT PRIMARY KEY,
+        value BLOB NOT NULL,
+        expires REAL,
+        accessed REAL NOT NULL,
+        size INTEGER NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS cache_entries_accessed ON cache_entries (accessed)",
+    "CREATE INDEX IF NOT EXISTS cache_entries_expires ON cache_entries (expires)"
+    " WHERE expires IS NOT NULL",
+    # Toplam adet/boyut trigger'larla tutulur; set basina tablo taramasi yok.
+    """
+    CREATE TABLE IF NOT EXISTS cache_stats (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        entries INTEGER NOT NULL,
+        bytes INTEGER NOT NULL
+    )
+    """,
+    "INSERT OR IGNORE INTO cache_stats (id, entries, bytes) VALUES (1, 0, 0)",
+    """
+    CREATE TRIGGER IF NOT EXISTS cache_entries_insert AFTER INSERT ON cache_entries BEGIN
+        UPDATE cache_stats SET entries = entries + 1, bytes = bytes + NEW.size WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS cache_entries_update AFTER UPDATE OF size ON cache_entries BEGIN
+        UPDATE cache_stats SET bytes = bytes - OLD.size + NEW.size WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS cache_entries_delete AFTER DELETE ON cache_entries BEGIN
+        UPDATE cache_stats SET entries = entries - 1, bytes = bytes - OLD.size WHERE id = 1;
+    END
+    """,
+)
+
+UPSERT = """
+    INSERT INTO cache_entries (key, value, expires, accessed, size) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (key) DO UPDATE SET
+        value = excluded.value,
+        expires = excluded.expires,
+        accessed = excluded.accessed,
+        size = excluded.size
+"""
+
+
+@contextmanager
+def _immediate(conn):
+    # Yazma kilidi islem basinda alinir; process'ler arasi yarisma busy_timeout ile beklenir.
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+# Ana DB'den ayri bir SQLite dosyasinda, tum worker process'lerinin paylastigi kalici cache.
+# Sinirlar MAX_ENTRIES ve MAX_BYTES: asilinca once suresi dolanlar, sonra en uzun suredir
+# okunmayanlar (LRU) silinir ve sinirlarin %90'ina inilir. Adet/boyut trigger'larla tutuldugu
+# icin set basina maliyet sabit; eviction sadece sinir asildiginda, indeks uzerinden calisir.
+# Okumalarda `accessed` en fazla ACCESS_RESOLUTION saniyede bir yazilir (yaklasik LRU).
+class SQLiteCache(BaseCache):
+    cull_target = 0.9
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self._path = os.path.join(location, "cache.sqlite3")
+        self._max_bytes = int(options.get("MAX_BYTES", 256 * 1024 * 1024))
+        self._access_resolution = float(options.get("ACCESS_RESOLUTION", 60))
+        self._busy_timeout = float(options.get("BUSY_TIMEOUT", 5))
+        self._local = threading.local()
+
+    def _connection(self):
+        # Thread basina baglanti; fork sonrasi ebeveynin baglantisi kullanilmaz.
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        conn = sqlite3.connect(self._path, timeout=self._busy_timeout, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with _immediate(conn):
+            for statement in SCHEMA:
+                conn.execute(statement)
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def _encode(self, key, value, timeout):
+        blob = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        expires = self.get_backend_timeout(timeout)
+        return key, blob, expires, time.time(), len(key) + len(blob)
+
+    def _cull(self, conn, now):
+        entries, size = conn.execute("SELECT entries, bytes FROM cache_stats").fetchone()
+        if entries <= self._max_entries and size <= self._max_bytes:
+            return
+        conn.execute("DELETE FROM cache_entries WHERE expires IS NOT NULL AND expires <= ?", (now,))
+        target_entries = int(self._max_entries * self.cull_target)
+        target_bytes = int(self._max_bytes * self.cull_target)
+        while True:
+            entries, size = conn.execute("SELECT entries, bytes FROM cache_stats").fetchone()
+            if entries <= target_entries and size <= target_bytes:
+                return
+            # Boyut asiminda kac satir gidecegi bilinmez; %10'luk LRU dilimleriyle ilerlenir.
+            batch = max(entries - target_entries, entries // 10, 1)
+            conn.execute(
+                "DELETE FROM cache_entries WHERE key IN "
+                "(SELECT key FROM cache_entries ORDER BY accessed LIMIT ?)",
+                (batch,),
+            )
+
+    def _read(self, conn, keys, now):
+        found = {}
+        stale = []
+        for start in range(0, len(keys), 500):
+            chunk = keys[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT key, value, expires, accessed FROM cache_entries "
+                f"WHERE key IN ({placeholders})",
+                chunk,
+            )
+            for key, blob, expires, accessed in rows:
+                if expires is not None and expires <= now:
+                    continue
+                found[key] = pickle.loads(blob)
+                if accessed < now - self._access_resolution:
+                    stale.append(key)
+        if stale:
+            with _immediate(conn):
+                conn.executemany(
+                    "UPDATE cache_entries SET accessed = ? WHERE key = ?",
+                    [(now, key) for key in stale],
+                )
+        return found
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        found = self._read(self._connection(), [key], time.time())
+        return found.get(key, default)
+
+    def get_many(self, keys, version=None):
+        keys = {self.make_and_validate_key(key, version=version): key for key in keys}
+        found = self._read(self._connection(), list(keys), time.time())
+        return {keys[key]: value for key, value in found.items()}
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT 1 FROM cache_entries WHERE key = ? AND (expires IS NULL OR expires > ?)",
+            (key, time.time()),
+        ).fetchone()
+        return row is not None
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.set_many({key: value}, timeout, version=version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        rows = [
+            self._encode(self.make_and_validate_key(key, version=version), value, timeout)
+            for key, value in data.items()
+        ]
+        conn = self._connection()
+        with _immediate(conn):
+            conn.executemany(UPSERT, rows)
+            self._cull(conn, time.time())
+        return []
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+        conn = self._connection()
+        with _immediate(conn):
+            existing = conn.execute(
+                "SELECT expires FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+            if existing and (existing[0] is None or existing[0] > now):
+                return False
+            conn.execute(UPSERT, self._encode(key, value, timeout))
+            self._cull(conn, now)
+        return True
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+        conn = self._connection()
+        with _immediate(conn):
+            updated = conn.execute(
+                "UPDATE cache_entries SET expires = ?, accessed = ? "
+                "WHERE key = ? AND (expires IS NULL OR expires > ?)",
+                (self.get_backend_timeout(timeout), now, key, now),
+            ).rowcount
+        return bool(updated)
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._connection()
+        with _immediate(conn):
+            deleted = conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,)).rowcount
+        return bool(deleted)
+
+    def delete_many(self, keys, version=None):
+        keys = [(self.make_and_validate_key(key, version=version),) for key in keys]
+        conn = self._connection()
+        with _immediate(conn):
+            conn.executemany("DELETE FROM cache_entries WHERE key = ?", keys)
+
+    def clear(self):
+        conn = self._connection()
+        with _immediate(conn):
+            conn.execute("DELETE FROM cache_entries")
@@ -0,0 +1,123 @@
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+DATA_VERSION_KEY = "data:version:{user_id}:{scope}"
+DATA_VERSION_TTL_SECONDS = 30 * 24 * 60 * 60
+
+
+def _version_key(user_id, scope):
+    return DATA_VERSION_KEY.format(user_id=user_id, scope=scope)
+
+
+# Kullanicinin verisi degistiginde (sync, kapatma, arsiv, webhook) cagrilir; sayfa ETag'leri degisir.
+def bump_data_version(user_ids, *scopes):
+    if isinstance(user_ids, int):
+        user_ids = [user_ids]
+    version = time.time()
+    cache.set_many(
+        {_version_key(user_id, scope): version for user_id in user_ids for scope in scopes},
+        DATA_VERSION_TTL_SECONDS,
+    )
+
+
+def _versions(user_id, scopes, found):
+    # Cache'ten dusmus surum yeniden olusturulur; sonraki istek tam render alir.
+    versions = []
+    missing = {}
+    for scope in scopes:
+        key = _version_key(user_id, scope)
+        version = found.get(key)
+        if version is None:
+            version = missing[key] = time.time()
+        versions.append(version)
+    return versions, missing
+
+
+def _validators(request, user_id, versions):
+    # Sayfalardaki "bugun", "son 30 gun", "bu ay" sayilari gun donunde veri degismeden de
+    # degisir; gun baslangici dogrulayicilara katilir ki dunun sayfasi 304 ile donmesin.
+    day_start = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+    versions = [*versions, day_start.timestamp()]
+    parts = [
+        str(user_id),
+        settings.APP_REVISION,
+        request.get_full_path(),
+        # Yeni CSRF token'i eski sayfayi gecersiz kilar (login/logout sonrasi).
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""),
+        *(repr(version) for version in versions),
+    ]
+    etag = hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+    return f'W/"{etag}"', int(max(versions))
+
+
+def _has_pending_messages(request):
+    # len() mesajlari okur ama "kullanildi" olarak isaretlemez.
+    return len(messages.get_messages(request)) > 0
+
+
+def _finish(response, etag, last_modified):
+    if response.status_code in (200, 304):
+        response.headers.setdefault("ETag", etag)
+        response.headers.setdefault("Last-Modified", http_date(last_modified))
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ["Cookie"])
+    return response
+
+
+def conditional_page(*scopes):
+    # Veri surumu degismediyse sayfa render edilmeden 304 doner. Bekleyen flash mesaj
+    # varsa kosullu cevap verilmez, mesaj tam sayfa ile gosterilir.
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+
+            @wraps(view_func)
+            async def _wrapper(request, *args, **kwargs):
+                user = await request.auser()
+                if request.method not in ("GET", "HEAD") or not user.is_authenticated:
+                    return await view_func(request, *args, **kwargs)
+                found = await cache.aget_many([_version_key(user.id, scope) for scope in scopes])
+                versions, missing = _versions(user.id, scopes, found)
+                if missing:
+                    await cache.aset_many(missing, DATA_VERSION_TTL_SECONDS)
+                etag, last_modified = _validators(request, user.id, versions)
+                if not await sync_to_async(_has_pending_messages)(request):
+                    response = get_conditional_response(
+                        request, etag=etag, last_modified=last_modified
+                    )
+                    if response is not None:
+                        return _finish(response, etag, last_modified)
+                response = await view_func(request, *args, **kwargs)
+                return _finish(response, etag, last_modified)
+
+        else:
+
+            @wraps(view_func)
+            def _wrapper(request, *args, **kwargs):
+                if request.method not in ("GET", "HEAD") or not request.user.is_authenticated:
+                    return view_func(request, *args, **kwargs)
+                user_id = request.user.id
+                found = cache.get_many([_version_key(user_id, scope) for scope in scopes])
+                versions, missing = _versions(user_id, scopes, found)
+                if missing:
+                    cache.set_many(missing, DATA_VERSION_TTL_SECONDS)
+                etag, last_modified = _validators(request, user_id, versions)
+                if not _has_pending_messages(request):
+                    response = get_conditional_response(
+                        request, etag=etag, last_modified=last_modified
+                    )
+                    if response is not None:
+                        return _finish(response, etag, last_modified)
+                return _finish(view_func(request, *args, **kwargs), etag, last_modified)
+
+        return _wrapper
+
+    return decorator
@@ -0,0 +1,67 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+EXPORT_CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson; charset=utf-8",
+}
+EXPORT_CHUNK_ROWS = 500
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+class _LineFormatter:
+    # fields: (kolon adi, .values() anahtari) ciftleri.
+    def __init__(self, export_format, fields):
+        self.export_format = export_format
+        self.fields = fields
+        self.writer = csv.writer(_Echo())
+
+    def head(self):
+        if self.export_format == "csv":
+            return self.writer.writerow([header for header, _ in self.fields])
+        return ""
+
+    def line(self, row):
+        if self.export_format == "csv":
+            return self.writer.writerow([row[key] for _, key in self.fields])
+        document = {header: row[key] for header, key in self.fields}
+        return json.dumps(document, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+
+
+# Satirlari EXPORT_CHUNK_ROWS'luk parcalar halinde metne cevirir; bellek kullanimi sabit kalir.
+def export_chunks(export_format, fields, rows):
+    formatter = _LineFormatter(export_format, fields)
+    chunk = [formatter.head()]
+    for row in rows:
+        chunk.append(formatter.line(row))
+        if len(chunk) >= EXPORT_CHUNK_ROWS:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+
+async def aexport_chunks(export_format, fields, rows):
+    formatter = _LineFormatter(export_format, fields)
+    chunk = [formatter.head()]
+    async for row in rows:
+        chunk.append(formatter.line(row))
+        if len(chunk) >= EXPORT_CHUNK_ROWS:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+
+def streaming_export_response(export_format, filename, chunks):
+    response = StreamingHttpResponse(chunks, content_type=EXPORT_CONTENT_TYPES[export_format])
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{export_format}"'
+    response["Cache-Control"] = "no-store"
+    return response
@@ -0,0 +1,174 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+METRICS = {
+    "outbound_requests_total": ("counter", "Outbound API calls by service, endpoint and status."),
+    "outbound_request_duration_seconds": ("histogram", "Outbound API call latency."),
+    "outbound_response_bytes_total": ("counter", "Outbound API response body bytes."),
+    "http_requests_total": ("counter", "Handled HTTP requests by view and status."),
+    "http_request_duration_seconds": ("histogram", "HTTP request latency by view."),
+    "http_request_db_queries": ("histogram", "Database queries per HTTP request by view."),
+}
+
+# Degerler process icinde tutulur; her worker kendi sayaclarini /metrics'te yayinlar.
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+_query_counter = ContextVar("metrics_query_counter", default=None)
+_outbound_listener = ContextVar("metrics_outbound_listener", default=None)
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def inc(name, labels, value=1):
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name, labels, value, buckets=LATENCY_BUCKETS):
+    key = _key(name, labels)
+    with _lock:
+        series = _histograms.get(key)
+        if series is None:
+            series = _histograms[key] = {
+                "buckets": buckets,
+                "counts": [0] * len(buckets),
+                "sum": 0,
+                "count": 0,
+            }
+        index = bisect_left(series["buckets"], value)
+        if index < len(series["counts"]):
+            series["counts"][index] += 1
+        series["sum"] += value
+        series["count"] += 1
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def render():
+    with _lock:
+        counters = dict(_counters)
+        histograms = {
+            key: {**series, "counts": list(series["counts"])} for key, series in _histograms.items()
+        }
+
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == "counter":
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{_format_labels(labels)} {value}")
+            continue
+        for (metric, labels), series in sorted(histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(series["buckets"], series["counts"]):
+                cumulative += count
+                lines.append(f"{name}_bucket{_format_labels(labels, [('le', bound)])} {cumulative}")
+            lines.append(
+                f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {series['count']}"
+            )
+            lines.append(f"{name}_sum{_format_labels(labels)} {series['sum']}")
+            lines.append(f"{name}_count{_format_labels(labels)} {series['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def listen_outbound(listener):
+    # Calisan sync kendi API cagrilarini saymak icin dinleyici kaydeder (None ile kaldirilir).
+    _outbound_listener.set(listener)
+
+
+def record_outbound(service, endpoint, method, status, duration, size=0):
+    listener = _outbound_listener.get()
+    if listener is not None:
+        listener(service, status, duration)
+    labels = {"service": service, "endpoint": endpoint, "method": method}
+    inc("outbound_requests_total", {**labels, "status": status})
+    observe("outbound_request_duration_seconds", labels, duration)
+    if size:
+        inc("outbound_response_bytes_total", labels, size)
+
+
+def timed_request(client, service, endpoint, method, url, **kwargs):
+    # endpoint, id'ler yerine sablon olarak verilir ("/shops/{shop_id}/receipts"); etiket sayisi sinirli kalir.
+    # status etiketi her zaman str: "200" ve "error" ayni seride siralanabilmeli.
+    started = time.perf_counter()
+    try:
+        response = client.request(method, url, **kwargs)
+    except Exception:
+        record_outbound(service, endpoint, method, "error", time.perf_counter() - started)
+        raise
+    record_outbound(
+        service,
+        endpoint,
+        method,
+        str(response.status_code),
+        time.perf_counter() - started,
+        len(response.content),
+    )
+    return response
+
+
+async def atimed_request(client, service, endpoint, method, url, **kwargs):
+    started = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+    except Exception:
+        record_outbound(service, endpoint, method, "error", time.perf_counter() - started)
+        raise
+    record_outbound(
+        service,
+        endpoint,
+        method,
+        str(response.status_code),
+        time.perf_counter() - started,
+        len(response.content),
+    )
+    return response
+
+
+def count_queries(execute, sql, params, many, context):
+    counter = _query_counter.get()
+    if counter is not None:
+        counter[0] += 1
+    return execute(sql, params, many, context)
+
+
+def install_query_counter(sender, connection, **kwargs):
+    if count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_queries)
+
+
+def start_query_count():
+    counter = [0]
+    return counter, _query_counter.set(counter)
+
+
+def stop_query_count(token):
+    _query_counter.reset(token)
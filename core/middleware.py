@@ -0,0 +1,62 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from . import metrics
+
+connection_created.connect(metrics.install_query_counter)
+
+
+def _view_label(request):
+    match = getattr(request, "resolver_match", None)
+    return match.view_name if match else "unmatched"
+
+
+class RequestMetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        # Middleware yuklenmeden once acilmis (kalici) baglantilar da sayilsin.
+        for connection in connections.all(initialized_only=True):
+            metrics.install_query_counter(None, connection)
+        started = time.perf_counter()
+        counter, token = metrics.start_query_count()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.stop_query_count(token)
+        self._record(request, response, time.perf_counter() - started, counter[0])
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        # sync_to_async ile calisan ORM cagrilari context'i kopyalar; sayac ayni listeyi artirir.
+        counter, token = metrics.start_query_count()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.stop_query_count(token)
+        self._record(request, response, time.perf_counter() - started, counter[0])
+        return response
+
+    def _record(self, request, response, duration, queries):
+        view = _view_label(request)
+        metrics.inc(
+            "http_requests_total",
+            {"view": view, "method": request.method, "status": str(response.status_code)},
+        )
+        metrics.observe("http_request_duration_seconds", {"view": view}, duration)
+        metrics.observe(
+            "http_request_db_queries", {"view": view}, queries, metrics.QUERY_COUNT_BUCKETS
+        )
@@ -51,6 +51,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -78,15 +79,52 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "core.wsgi.application"
+ASGI_APPLICATION = "core.asgi.application"
 
 
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+SQLITE_BUSY_TIMEOUT_SECONDS = int(os.getenv("SQLITE_BUSY_TIMEOUT_SECONDS", "20"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "OPTIONS": {
+            # Sync yazarken sayfa okumalari beklemesin: WAL + kisa yazma kilitleri.
+            "timeout": SQLITE_BUSY_TIMEOUT_SECONDS,
+            "transaction_mode": "IMMEDIATE",
+            "init_command": (
+                "PRAGMA journal_mode=WAL;"
+                "PRAGMA synchronous=NORMAL;"
+                f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_SECONDS * 1000};"
+                f"PRAGMA mmap_size={SQLITE_MMAP_SIZE};"
+                f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB};"
+                "PRAGMA temp_store=MEMORY;"
+            ),
+        },
+        # Testler de dosya tabanli DB'de kosar; bellek ici DB'de WAL ve eszamanli baglanti olmaz.
+        "TEST": {"NAME": BASE_DIR / "test_db.sqlite3"},
+    }
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+
+# Kalici, paylasilan cache: DJANGO_CACHE_DIR altinda ayri bir SQLite dosyasi (ana DB kilidine
+# girmez). Adet ve bayt siniri asilinca LRU ile silinir; bkz. core/cache.py.
+CACHES = {
+    "default": {
+        "BACKEND": "core.cache.SQLiteCache",
+        "LOCATION": os.getenv("DJANGO_CACHE_DIR", str(BASE_DIR / ".cache")),
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.getenv("DJANGO_CACHE_MAX_ENTRIES", "20000")),
+            "MAX_BYTES": int(os.getenv("DJANGO_CACHE_MAX_BYTES", str(256 * 1024 * 1024))),
+        },
     }
 }
 
@@ -129,15 +167,46 @@ STATIC_URL = "/static/"
 STATICFILES_DIRS = [
     BASE_DIR / "static",
 ]
+# collectstatic ciktisi: hash'li isimler, staticfiles.json manifest'i ve .gz kopyalari.
+STATIC_ROOT = BASE_DIR / "staticfiles"
+
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "core.storage.CompressedManifestStaticFilesStorage",
+    },
+}
 
 ETSY_CLIENT_ID = os.getenv("ETSY_CLIENT_ID", "")
 ETSY_SHARED_SECRET = os.getenv("ETSY_SHARED_SECRET", "")
 ETSY_REDIRECT_URI = os.getenv("ETSY_REDIRECT_URI", "")
 ETSY_SCOPES = os.getenv("ETSY_SCOPES", "")
+# Toplu listing duzenlemede Etsy'ye ayni anda giden en fazla istek (listings_w scope'u gerekir).
+ETSY_BULK_EDIT_CONCURRENCY = int(os.getenv("ETSY_BULK_EDIT_CONCURRENCY", "4"))
 
 SHIPENTEGRA_CLIENT_ID = os.getenv("SHIPENTEGRA_CLIENT_ID", "")
 SHIPENTEGRA_CLIENT_SECRET = os.getenv("SHIPENTEGRA_CLIENT_SECRET", "")
 SHIPENTEGRA_BASE_URL = os.getenv("SHIPENTEGRA_BASE_URL", "")
+SHIPENTEGRA_WEBHOOK_SECRET = os.getenv("SHIPENTEGRA_WEBHOOK_SECRET", "")
+# Webhook aktifken sync sirasindaki takip sorgusu sadece bu sureden eski kayitlar icin yapilir (0 = her sync).
+SHIPENTEGRA_POLL_INTERVAL_MINUTES = int(os.getenv("SHIPENTEGRA_POLL_INTERVAL_MINUTES", "0"))
+
+ORDER_CARD_CACHE_TIMEOUT = 24 * 60 * 60
+ORDER_PAGE_SIZE = 20
+# Kapatilan siparisler bu kadar gun sonra arsive, arsivdekiler bu kadar gun sonra soguk depoya alinir.
+ORDER_AUTO_ARCHIVE_DAYS = int(os.getenv("ORDER_AUTO_ARCHIVE_DAYS", "14"))
+ORDER_COLD_STORAGE_DAYS = int(os.getenv("ORDER_COLD_STORAGE_DAYS", "180"))
+
+# Ayni hesap icin ayni turde tek sync calisir; worker cokerse kilit bu kadar saniye sonra duser.
+SYNC_LEASE_SECONDS = int(os.getenv("SYNC_LEASE_SECONDS", "600"))
+
+# Deploy surumu (or. git sha); sayfa ETag'lerine girer, yeni sablonlar eski 304'lerle gelmez.
+APP_REVISION = os.getenv("APP_REVISION", "")
+
+# /metrics icin Prometheus Bearer token'i; bos ise sadece staff kullanicilar gorebilir.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
 
 LOGIN_URL = "/accounts/login/"
 LOGIN_REDIRECT_URL = "/"
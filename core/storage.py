@@ -0,0 +1,39 @@
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+GZIP_EXTENSIONS = (".css", ".js", ".svg", ".json", ".map", ".txt", ".html", ".xml")
+GZIP_MIN_SIZE = 256
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    # collectstatic: icerik hash'li isimler + manifest + yaninda .gz kopyalari.
+    def stored_name(self, name):
+        # collectstatic calistirilmamis ortamda (testler, komutlar, yerel deneme) sayfa patlamasin;
+        # manifest ya da kayit yoksa duz isim kullanilir.
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if not dry_run and isinstance(hashed_name, str):
+                self._write_gzip(hashed_name)
+            yield name, hashed_name, processed
+
+    def _write_gzip(self, name):
+        if not name.endswith(GZIP_EXTENSIONS):
+            return
+        with self.open(name) as source:
+            content = source.read()
+        if len(content) < GZIP_MIN_SIZE:
+            return
+        compressed = gzip.compress(content, compresslevel=9, mtime=0)
+        if len(compressed) >= len(content):
+            return
+        gzip_name = f"{name}.gz"
+        if self.exists(gzip_name):
+            self.delete(gzip_name)
+        self._save(gzip_name, ContentFile(compressed))
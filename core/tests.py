@@ -0,0 +1,111 @@
+import json
+import tempfile
+from unittest import mock
+
+import httpx
+from django.test import SimpleTestCase
+
+from . import metrics
+from .cache import SQLiteCache
+from .storage import CompressedManifestStaticFilesStorage
+
+
+class MetricsRenderTests(SimpleTestCase):
+    def setUp(self):
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+
+    def test_render_with_success_and_error_status_on_same_endpoint(self):
+        def handler(request):
+            if request.url.path == "/down":
+                raise httpx.ConnectError("down", request=request)
+            return httpx.Response(200, json={})
+
+        with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+            metrics.timed_request(client, "etsy", "/x", "GET", "https://example.test/up")
+            with self.assertRaises(httpx.ConnectError):
+                metrics.timed_request(client, "etsy", "/x", "GET", "https://example.test/down")
+
+        output = metrics.render()
+        self.assertIn(
+            'outbound_requests_total{endpoint="/x",method="GET",service="etsy",status="200"} 1',
+            output,
+        )
+        self.assertIn(
+            'outbound_requests_total{endpoint="/x",method="GET",service="etsy",status="error"} 1',
+            output,
+        )
+
+
+class StaticStorageTests(SimpleTestCase):
+    def test_missing_manifest_falls_back_to_plain_name(self):
+        with tempfile.TemporaryDirectory() as root:
+            storage = CompressedManifestStaticFilesStorage(location=root, base_url="/static/")
+            self.assertEqual(storage.url("js/app.js"), "/static/js/app.js")
+
+            with open(f"{root}/staticfiles.json", "w") as manifest:
+                json.dump({"version": "1.1", "paths": {"js/app.js": "js/app.abc123.js"}}, manifest)
+            storage = CompressedManifestStaticFilesStorage(location=root, base_url="/static/")
+            self.assertEqual(storage.url("js/app.js"), "/static/js/app.abc123.js")
+            self.assertEqual(storage.url("js/other.js"), "/static/js/other.js")
+
+
+class SQLiteCacheTests(SimpleTestCase):
+    def cache(self, **options):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        return SQLiteCache(root.name, {"OPTIONS": {"ACCESS_RESOLUTION": 0, **options}})
+
+    def stats(self, cache):
+        return cache._connection().execute("SELECT entries, bytes FROM cache_stats").fetchone()
+
+    def test_basic_operations(self):
+        cache = self.cache()
+        cache.set("a", {"x": 1})
+        cache.set_many({"b": 2, "c": 3}, timeout=None)
+        self.assertEqual(cache.get("a"), {"x": 1})
+        self.assertEqual(cache.get_many(["a", "b", "missing"]), {"a": {"x": 1}, "b": 2})
+        self.assertFalse(cache.add("b", 5))
+        self.assertTrue(cache.add("d", 4))
+        self.assertTrue(cache.delete("a"))
+        self.assertFalse(cache.has_key("a"))
+        cache.set("a", "again")
+        cache.set("a", "replaced")
+        self.assertEqual(cache.get("a"), "replaced")
+        self.assertEqual(self.stats(cache)[0], 4)
+        cache.clear()
+        self.assertEqual(self.stats(cache), (0, 0))
+
+    def test_expired_entries_are_misses(self):
+        cache = self.cache()
+        now = [1000]
+        with mock.patch("time.time", lambda: now[0]):
+            cache.set("a", 1, timeout=2)
+            self.assertEqual(cache.get("a"), 1)
+            now[0] += 2
+            self.assertIsNone(cache.get("a"))
+            self.assertTrue(cache.add("a", 2))
+
+    def test_entry_limit_evicts_least_recently_used(self):
+        cache = self.cache(MAX_ENTRIES=10)
+        now = [1000]
+        with mock.patch("time.time", lambda: now[0]):
+            for index in range(10):
+                now[0] += 1
+                cache.set(f"k{index}", index)
+            now[0] += 1
+            cache.get("k0")
+            now[0] += 1
+            cache.set("k10", 10)
+            remaining = set(cache.get_many([f"k{index}" for index in range(11)]))
+        self.assertEqual(remaining, {"k0", *(f"k{index}" for index in range(3, 11))})
+        self.assertEqual(self.stats(cache)[0], 9)
+
+    def test_byte_limit(self):
+        cache = self.cache(MAX_BYTES=20_000)
+        for index in range(50):
+            cache.set(f"k{index}", "x" * 1000)
+        entries, size = self.stats(cache)
+        self.assertLessEqual(size, 20_000)
+        self.assertTrue(cache.has_key("k49"))
+        self.assertEqual(entries, len(cache.get_many([f"k{index}" for index in range(50)])))
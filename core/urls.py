@@ -15,15 +15,26 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path, include
-from django.views.generic import TemplateView
+from django.urls import path, include, re_path
+
+from orders.views import dashboard
+
+from .views import metrics, static_file
 
 urlpatterns = [
     path("admin/", admin.site.urls),
-    path("", TemplateView.as_view(template_name="dashboard.html"), name="home"),
+    path("metrics", metrics, name="metrics"),
+    path("", dashboard, name="home"),
     path("accounts/", include("django.contrib.auth.urls")),
     path("etsy/", include("etsy.urls")),
     path("listings/", include("listings.urls")),
     path("orders/", include("orders.urls")),
 ]
+
+# DEBUG'da runserver (staticfiles) servis eder; aksi halde collectstatic ciktisi buradan gelir.
+if not settings.DEBUG:
+    urlpatterns += [
+        re_path(rf"^{settings.STATIC_URL.strip('/')}/(?P<path>.+)$", static_file, name="static"),
+    ]
@@ -0,0 +1,64 @@
+import hmac
+import mimetypes
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseForbidden
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.functional import SimpleLazyObject
+
+from . import metrics as request_metrics
+
+STATIC_IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+STATIC_UNHASHED_MAX_AGE = 60 * 60
+
+# collectstatic manifest'indeki hash'li isimler; bunlarin icerigi asla degismez.
+_hashed_static_names = SimpleLazyObject(
+    lambda: frozenset(getattr(staticfiles_storage, "hashed_files", {}).values())
+)
+
+
+def metrics(request):
+    # Prometheus icin METRICS_TOKEN ile Bearer erisim; token yoksa sadece staff kullanicilar.
+    token = settings.METRICS_TOKEN
+    if token:
+        header = request.headers.get("Authorization", "")
+        if not hmac.compare_digest(header, f"Bearer {token}"):
+            return HttpResponseForbidden()
+    elif not request.user.is_staff:
+        return HttpResponseForbidden()
+    return HttpResponse(
+        request_metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+def static_file(request, path):
+    # DEBUG kapaliyken STATIC_ROOT'tan servis: hash'li dosyalara immutable cache,
+    # istemci gzip kabul ediyorsa collectstatic'in urettigi .gz kopyasi.
+    try:
+        full_path = safe_join(settings.STATIC_ROOT, path)
+    except ValueError as exc:
+        raise Http404 from exc
+    if not os.path.isfile(full_path):
+        raise Http404
+
+    content_type, _ = mimetypes.guess_type(full_path)
+    serve_path = full_path
+    encoding = None
+    if "gzip" in request.headers.get("Accept-Encoding", "") and os.path.isfile(f"{full_path}.gz"):
+        serve_path = f"{full_path}.gz"
+        encoding = "gzip"
+
+    response = FileResponse(
+        open(serve_path, "rb"), content_type=content_type or "application/octet-stream"
+    )
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    if path in _hashed_static_names:
+        response.headers["Cache-Control"] = f"public, max-age={STATIC_IMMUTABLE_MAX_AGE}, immutable"
+    else:
+        response.headers["Cache-Control"] = f"public, max-age={STATIC_UNHASHED_MAX_AGE}"
+    patch_vary_headers(response, ["Accept-Encoding"])
+    return response
@@ -1,7 +1,23 @@
+import asyncio
+
 import httpx
 from django.conf import settings
 
+from core.metrics import atimed_request, timed_request
+
 API_BASE = "https://api.etsy.com/v3/application"
+# 429 (rate limit) cevabinda Retry-After kadar beklenip en fazla bu kadar tekrar denenir.
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_MAX_WAIT = 30
+
+
+def _retry_after(response, attempt):
+    try:
+        wait = float(response.headers.get("Retry-After", ""))
+    except ValueError:
+        wait = 2**attempt
+    return min(max(wait, 0), RATE_LIMIT_MAX_WAIT)
+
 
 class EtsyClient:
     def __init__(self, access_token: str):
@@ -15,6 +31,25 @@ class EtsyClient:
         }
 
 
+    def _get(self, endpoint: str, url: str, params: dict | None = None):
+        # endpoint metrik etiketi olarak kullanilir: id'siz sablon yolu ("/shops/{shop_id}/receipts").
+        with httpx.Client(timeout=20) as client:
+            r = timed_request(client, "etsy", endpoint, "GET", url, headers=self._headers(), params=params)
+            r.raise_for_status()
+            return r.json()
+
+    async def _arequest(self, client, endpoint: str, method: str, url: str, **kwargs):
+        # client: paylasilan httpx.AsyncClient; toplu islemlerde baglantilar tekrar kullanilir.
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            r = await atimed_request(
+                client, "etsy", endpoint, method, url, headers=self._headers(), **kwargs
+            )
+            if r.status_code != 429 or attempt == RATE_LIMIT_RETRIES:
+                break
+            await asyncio.sleep(_retry_after(r, attempt))
+        r.raise_for_status()
+        return r.json()
+
     def get_shop_id_for_me(self):
         # “me” üzerinden shop bulma: ileride sağlamlaştırırız
         url = f"{API_BASE}/shops?shop_name="  # placeholder: shop_id’yi biz DB’ye ekleyeceğiz
@@ -23,31 +58,29 @@ class EtsyClient:
     def get_active_listings(self, shop_id: int, limit: int = 50, offset: int = 0):
         url = f"{API_BASE}/shops/{shop_id}/listings/active"
         params = {"limit": limit, "offset": offset}
-        with httpx.Client(timeout=20) as client:
-            r = client.get(url, headers=self._headers(), params=params)
-            r.raise_for_status()
-            return r.json()
-            
+        return self._get("/shops/{shop_id}/listings/active", url, params)
+
     def get_user_shops(self, user_id: int):
         url = f"{API_BASE}/users/{user_id}/shops"
-        with httpx.Client(timeout=20) as client:
-            r = client.get(url, headers=self._headers())
-            r.raise_for_status()
-            return r.json()
+        return self._get("/users/{user_id}/shops", url)
 
     def get_listing_images(self, listing_id: int):
         url = f"{API_BASE}/listings/{listing_id}/images"
-        with httpx.Client(timeout=20) as client:
-            r = client.get(url, headers=self._headers())
-            r.raise_for_status()
-            return r.json()
+        return self._get("/listings/{listing_id}/images", url)
 
     def get_shop_receipts(self, shop_id: int, limit: int = 50, offset: int = 0, min_created: int | None = None):
         url = f"{API_BASE}/shops/{shop_id}/receipts"
         params = {"limit": limit, "offset": offset}
         if min_created is not None:
             params["min_created"] = min_created
-        with httpx.Client(timeout=20) as client:
-            r = client.get(url, headers=self._headers(), params=params)
-            r.raise_for_status()
-            return r.json()
+        return self._get("/shops/{shop_id}/receipts", url, params)
+
+    async def aget_listing_inventory(self, client, listing_id: int):
+        url = f"{API_BASE}/listings/{listing_id}/inventory"
+        return await self._arequest(client, "/listings/{listing_id}/inventory", "GET", url)
+
+    async def aupdate_listing_inventory(self, client, listing_id: int, inventory: dict):
+        url = f"{API_BASE}/listings/{listing_id}/inventory"
+        return await self._arequest(
+            client, "/listings/{listing_id}/inventory", "PUT", url, json=inventory
+        )
@@ -0,0 +1,73 @@
+import secrets
+import time
+
+from django.conf import settings
+from django.contrib import messages
+from django.db import IntegrityError, transaction
+from django.http import JsonResponse
+from django.shortcuts import redirect
+from django.utils import timezone
+
+from .models import SyncLease
+
+
+class SyncAlreadyRunning(Exception):
+    def __init__(self, lease):
+        super().__init__(f"{lease.kind} sync is already running.")
+        self.lease = lease
+
+
+class SyncLeaseHandle:
+    def __init__(self, user_id, kind, token, run_id=""):
+        self.user_id = user_id
+        self.kind = kind
+        self.token = token
+        self.run_id = run_id
+        self._renewed_at = time.monotonic()
+
+    def _active(self):
+        return SyncLease.objects.filter(owner_id=self.user_id, kind=self.kind, token=self.token)
+
+    def renew_if_due(self):
+        # Uzun sync'lerde sure dolmasin diye surenin ucte birinde bir uzatilir.
+        if time.monotonic() - self._renewed_at < settings.SYNC_LEASE_SECONDS / 3:
+            return True
+        self._renewed_at = time.monotonic()
+        expires_at = timezone.now() + timezone.timedelta(seconds=settings.SYNC_LEASE_SECONDS)
+        return bool(self._active().update(expires_at=expires_at))
+
+    def release(self):
+        self._active().delete()
+
+
+def acquire_sync_lease(user_id, kind, run_id=""):
+    token = secrets.token_hex(16)
+    now = timezone.now()
+    values = {
+        "token": token,
+        "run_id": run_id[:64],
+        "acquired_at": now,
+        "expires_at": now + timezone.timedelta(seconds=settings.SYNC_LEASE_SECONDS),
+    }
+    # Suresi dolmus kayit tek kosullu UPDATE ile devralinir; yoksa yeni kayit acilir.
+    taken = SyncLease.objects.filter(owner_id=user_id, kind=kind, expires_at__lte=now).update(
+        **values
+    )
+    if not taken:
+        try:
+            with transaction.atomic():
+                SyncLease.objects.create(owner_id=user_id, kind=kind, **values)
+        except IntegrityError:
+            lease = SyncLease.objects.filter(owner_id=user_id, kind=kind).first()
+            if lease is None:
+                return acquire_sync_lease(user_id, kind, run_id)
+            raise SyncAlreadyRunning(lease)
+    return SyncLeaseHandle(user_id, kind, token, run_id)
+
+
+def already_running_response(request, running, message, redirect_to):
+    # fetch ile gelen istek calisan sync'in run id'sini alir ve onun ilerlemesine baglanir.
+    if "application/json" in request.headers.get("Accept", ""):
+        return JsonResponse({"status": "running", "run": running.lease.run_id}, status=409)
+    messages.info(request, message)
+    return redirect(redirect_to)
@@ -16,3 +16,49 @@ class EtsyAccount(models.Model):
 
     def is_access_token_valid(self):
         return self.expires_at and self.expires_at > timezone.now()
+
+
+class SyncRun(models.Model):
+    class Status(models.TextChoices):
+        DONE = "done", "Done"
+        ERROR = "error", "Error"
+
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="sync_runs")
+    kind = models.CharField(max_length=20)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.DONE)
+    message = models.TextField(blank=True)
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField()
+    duration_seconds = models.FloatField(default=0)
+    pages = models.PositiveIntegerField(default=0)
+    records = models.PositiveIntegerField(default=0)
+    inserted = models.PositiveIntegerField(default=0)
+    updated = models.PositiveIntegerField(default=0)
+    unchanged = models.PositiveIntegerField(default=0)
+    tracking_lookups = models.PositiveIntegerField(default=0)
+    errors = models.PositiveIntegerField(default=0)
+    api_calls = models.PositiveIntegerField(default=0)
+    api_seconds = models.FloatField(default=0)
+    # {"etsy": {"calls", "seconds", "errors"}, "shipentegra": {...}, "database": {"seconds"}}
+    phases = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        ordering = ["-started_at"]
+        indexes = [
+            models.Index(fields=["owner", "-started_at"], name="etsy_syncrun_owner_idx"),
+        ]
+
+
+class SyncLease(models.Model):
+    # Hesap + sync turu basina tek calisan sync; expires_at gecmisse (worker coktu) yeniden alinabilir.
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="sync_leases")
+    kind = models.CharField(max_length=20)
+    token = models.CharField(max_length=32)
+    run_id = models.CharField(max_length=64, blank=True)
+    acquired_at = models.DateTimeField()
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["owner", "kind"], name="etsy_synclease_owner_kind_uniq"),
+        ]
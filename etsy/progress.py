@@ -0,0 +1,129 @@
+import time
+from contextlib import contextmanager, nullcontext
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.utils import timezone
+
+from core.metrics import listen_outbound
+
+from .models import SyncRun
+
+PROGRESS_CACHE_KEY = "sync:progress:{user_id}:{kind}"
+PROGRESS_TTL_SECONDS = 60 * 60
+PROGRESS_FLUSH_SECONDS = 0.5
+PROGRESS_COUNTERS = (
+    "pages",
+    "records",
+    "inserted",
+    "updated",
+    "unchanged",
+    "tracking_lookups",
+    "errors",
+    "api_calls",
+)
+
+
+def _progress_key(user_id, kind):
+    return PROGRESS_CACHE_KEY.format(user_id=user_id, kind=kind)
+
+
+class SyncProgress:
+    # Calisan sync'in sayaclarini cache'e yazar; SSE endpoint'i buradan okur.
+    # Bitiste tum sayac ve faz sureleri tek bir SyncRun kaydina yazilir.
+    def __init__(self, user_id, kind, run_id="", lease=None):
+        self.user_id = user_id
+        self.lease = lease
+        self.key = _progress_key(user_id, kind)
+        self.started_at = timezone.now()
+        self._started = time.perf_counter()
+        self.phases = {}
+        self.state = {
+            "kind": kind,
+            "run": run_id,
+            "status": "running",
+            "message": "",
+            "started_at": self.started_at.isoformat(),
+            **{counter: 0 for counter in PROGRESS_COUNTERS},
+        }
+        self._flushed_at = 0
+        self.flush(force=True)
+        listen_outbound(self._api_call)
+
+    def _api_call(self, service, status, duration):
+        phase = self.phases.setdefault(service, {"calls": 0, "seconds": 0, "errors": 0})
+        phase["calls"] += 1
+        phase["seconds"] += duration
+        if status == "error" or int(status) >= 400:
+            phase["errors"] += 1
+        self.add("api_calls")
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            phase = self.phases.setdefault(name, {"seconds": 0})
+            phase["seconds"] += time.perf_counter() - started
+
+    def add(self, counter, amount=1):
+        self.state[counter] += amount
+        self.flush()
+
+    def error(self, message):
+        self.state["errors"] += 1
+        self.state["message"] = message
+        self.flush(force=True)
+
+    def finish(self, status="done", message=""):
+        listen_outbound(None)
+        self.state["status"] = status
+        self.state["message"] = message
+        self.flush(force=True)
+        self._save_run(status, message)
+
+    def _save_run(self, status, message):
+        finished_at = timezone.now()
+        phases = {
+            name: {key: round(value, 3) for key, value in values.items()}
+            for name, values in self.phases.items()
+        }
+        SyncRun.objects.create(
+            owner_id=self.user_id,
+            kind=self.state["kind"],
+            status=status,
+            message=message,
+            started_at=self.started_at,
+            finished_at=finished_at,
+            duration_seconds=round(time.perf_counter() - self._started, 3),
+            api_seconds=round(
+                sum(values.get("seconds", 0) for name, values in phases.items() if "calls" in values),
+                3,
+            ),
+            phases=phases,
+            **{counter: self.state[counter] for counter in PROGRESS_COUNTERS},
+        )
+
+    def flush(self, force=False):
+        now = time.monotonic()
+        if not force and now - self._flushed_at < PROGRESS_FLUSH_SECONDS:
+            return
+        self._flushed_at = now
+        cache.set(self.key, dict(self.state), PROGRESS_TTL_SECONDS)
+        if self.lease:
+            self.lease.renew_if_due()
+
+
+def sync_phase(progress, name):
+    return progress.phase(name) if progress else nullcontext()
+
+
+def get_progress(user_id, kind):
+    return cache.get(_progress_key(user_id, kind))
+
+
+# cache.aget thread_sensitive calisir: ASGI'da her SSE baglantisi akis boyunca kendi thread'ini
+# tutardi. Cache backend'i thread-safe; okumalar ortak thread havuzundan yapilir.
+async def aget_progress(user_id, kind):
+    return await sync_to_async(get_progress, thread_sensitive=False)(user_id, kind)
@@ -1,3 +1,105 @@
-from django.test import TestCase
+import threading
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from .leases import SyncAlreadyRunning, acquire_sync_lease
+from .models import SyncLease
+from .progress import aget_progress
+
+
+class ProgressReadTests(TestCase):
+    def test_aget_progress_does_not_use_thread_sensitive_executor(self):
+        # async_to_sync altinda thread_sensitive cagrilar cagiran (ana) thread'de kosar.
+        threads = []
+        real_get = cache.get
+
+        def get(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return real_get(*args, **kwargs)
+
+        with mock.patch.object(cache, "get", get):
+            async_to_sync(aget_progress)(1, "orders")
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.main_thread())
+
+
+class SyncLeaseTests(TransactionTestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("seller")
+
+    def expire(self):
+        SyncLease.objects.filter(owner=self.user).update(
+            expires_at=timezone.now() - timezone.timedelta(seconds=1)
+        )
+
+    def test_running_lease_refuses_second_sync(self):
+        handle = acquire_sync_lease(self.user.id, "orders", "run-1")
+        with self.assertRaises(SyncAlreadyRunning) as raised:
+            acquire_sync_lease(self.user.id, "orders", "run-2")
+        self.assertEqual(raised.exception.lease.run_id, "run-1")
+        # Tur basina ayri kilit.
+        acquire_sync_lease(self.user.id, "listings")
+        handle.release()
+        acquire_sync_lease(self.user.id, "orders", "run-3")
+
+    def test_expired_lease_is_taken_over(self):
+        stale = acquire_sync_lease(self.user.id, "orders", "run-1")
+        self.expire()
+        fresh = acquire_sync_lease(self.user.id, "orders", "run-2")
+
+        lease = SyncLease.objects.get(owner=self.user, kind="orders")
+        self.assertEqual((lease.token, lease.run_id), (fresh.token, "run-2"))
+        self.assertGreater(lease.expires_at, timezone.now())
+        self.assertNotEqual(stale.token, fresh.token)
+
+    def test_stale_token_cannot_renew_or_release(self):
+        stale = acquire_sync_lease(self.user.id, "orders", "run-1")
+        self.expire()
+        fresh = acquire_sync_lease(self.user.id, "orders", "run-2")
+
+        stale._renewed_at -= settings.SYNC_LEASE_SECONDS
+        self.assertFalse(stale.renew_if_due())
+        stale.release()
+        self.assertEqual(SyncLease.objects.get(owner=self.user, kind="orders").token, fresh.token)
+
+        fresh._renewed_at -= settings.SYNC_LEASE_SECONDS
+        self.assertTrue(fresh.renew_if_due())
+        fresh.release()
+        self.assertFalse(SyncLease.objects.filter(owner=self.user).exists())
+
+    def test_concurrent_syncs_get_one_lease(self):
+        workers = 4
+        barrier = threading.Barrier(workers)
+        handles = []
+        refused = []
+        errors = []
+
+        def run(index):
+            try:
+                barrier.wait()
+                handles.append(acquire_sync_lease(self.user.id, "orders", f"run-{index}"))
+            except SyncAlreadyRunning as running:
+                refused.append(running.lease.run_id)
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=run, args=(index,)) for index in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(handles), 1)
+        self.assertEqual(len(refused), workers - 1)
+        lease = SyncLease.objects.get(owner=self.user, kind="orders")
+        self.assertEqual(lease.token, handles[0].token)
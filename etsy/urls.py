@@ -1,7 +1,9 @@
 from django.urls import path
-from .views import callback, connect
+from .views import callback, connect, sync_progress, sync_runs
 
 urlpatterns = [
     path("connect/", connect, name="etsy_connect"),
     path("callback/", callback, name="etsy_callback"),
+    path("sync/<str:kind>/progress/", sync_progress, name="etsy_sync_progress"),
+    path("syncs/", sync_runs, name="etsy_sync_runs"),
 ]
@@ -1,19 +1,33 @@
+import asyncio
+import json
 from urllib.parse import urlencode
 
 import httpx
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.shortcuts import redirect
+from django.db.models import Avg, Count, Sum
+from django.db.models.functions import TruncDate
+from django.shortcuts import redirect, render
 from django.utils import timezone
-from django.http import HttpResponseBadRequest
+from django.http import Http404, HttpResponseBadRequest, StreamingHttpResponse
 
-from .models import EtsyAccount
+from core.metrics import atimed_request
+
+from .models import EtsyAccount, SyncRun
 from .pkce import generate_code_verifier, generate_code_challenge, generate_state
+from .progress import aget_progress
 
 
 AUTHORIZE_URL = "https://www.etsy.com/oauth/connect"
+SYNC_RUN_LIST_SIZE = 50
+SYNC_RUN_TREND_DAYS = 14
 TOKEN_URL = "https://api.etsy.com/v3/public/oauth/token"  # Etsy dokümanı :contentReference[oaicite:3]{index=3}
 
+SYNC_KINDS = {"orders", "listings"}
+SSE_POLL_SECONDS = 0.5
+SSE_HEARTBEAT_SECONDS = 15
+SSE_MAX_SECONDS = 30 * 60
+
 @login_required
 def connect(request):
     verifier = generate_code_verifier()
@@ -37,21 +51,21 @@ def connect(request):
 
 
 @login_required
-def callback(request):
+async def callback(request):
     # Etsy, redirect_uri’ye code + state ile döner :contentReference[oaicite:4]{index=4}
     code = request.GET.get("code")
     state = request.GET.get("state")
     if not code or not state:
         return HttpResponseBadRequest("Missing code/state")
 
-    expected_state = request.session.get("etsy_oauth_state")
-    verifier = request.session.get("etsy_code_verifier")
+    expected_state = await request.session.aget("etsy_oauth_state")
+    verifier = await request.session.aget("etsy_code_verifier")
     if not expected_state or state != expected_state or not verifier:
         return HttpResponseBadRequest("Invalid state (CSRF)")
 
     # State’i tek kullanımlık yap
-    request.session.pop("etsy_oauth_state", None)
-    request.session.pop("etsy_code_verifier", None)
+    await request.session.apop("etsy_oauth_state", None)
+    await request.session.apop("etsy_code_verifier", None)
 
     data = {
         "grant_type": "authorization_code",
@@ -62,8 +76,9 @@ def callback(request):
     }
 
     # Etsy token endpoint: form-encoded POST :contentReference[oaicite:5]{index=5}
-    with httpx.Client(timeout=20) as client:
-        resp = client.post(TOKEN_URL, data=data)
+    # Token istegi beklenirken worker baska istekleri islemeye devam eder.
+    async with httpx.AsyncClient(timeout=20) as client:
+        resp = await atimed_request(client, "etsy", "/oauth/token", "POST", TOKEN_URL, data=data)
         resp.raise_for_status()
         payload = resp.json()
 
@@ -78,14 +93,81 @@ def callback(request):
         if maybe_prefix.isdigit():
             etsy_user_id = int(maybe_prefix)
 
-    account, _ = EtsyAccount.objects.get_or_create(user=request.user)
+    user = await request.auser()
+    account, _ = await EtsyAccount.objects.aget_or_create(user=user)
     account.etsy_user_id = etsy_user_id
     account.access_token = access_token
     account.refresh_token = refresh_token
     account.expires_at = timezone.now() + timezone.timedelta(seconds=expires_in)
     account.scopes = settings.ETSY_SCOPES
     account.last_connected_at = timezone.now()
-    account.save()
+    await account.asave()
 
     return redirect("listings_home")
 
+
+async def _progress_events(user_id, kind, run_id):
+    last_state = None
+    idle = 0.0
+    elapsed = 0.0
+    yield "retry: 2000\n\n"
+    while elapsed < SSE_MAX_SECONDS:
+        state = await aget_progress(user_id, kind)
+        # Istemcinin baslattigi calisma henuz yazilmadiysa eski sonucu gonderme.
+        if state and run_id and state.get("run") != run_id:
+            state = None
+        if state and state != last_state:
+            yield f"data: {json.dumps(state)}\n\n"
+            last_state = state
+            idle = 0.0
+            if state.get("status") != "running":
+                return
+        elif idle >= SSE_HEARTBEAT_SECONDS:
+            yield ": keep-alive\n\n"
+            idle = 0.0
+        await asyncio.sleep(SSE_POLL_SECONDS)
+        idle += SSE_POLL_SECONDS
+        elapsed += SSE_POLL_SECONDS
+
+
+@login_required
+async def sync_progress(request, kind):
+    if kind not in SYNC_KINDS:
+        raise Http404
+    user = await request.auser()
+    response = StreamingHttpResponse(
+        _progress_events(user.id, kind, request.GET.get("run", "")),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@login_required
+def sync_runs(request):
+    runs = SyncRun.objects.filter(owner=request.user)
+    since = timezone.now() - timezone.timedelta(days=SYNC_RUN_TREND_DAYS)
+    # Gunluk egilim tek gruplu sorguyla hesaplanir.
+    trends = (
+        runs.filter(started_at__gte=since)
+        .annotate(day=TruncDate("started_at"))
+        .values("day", "kind")
+        .annotate(
+            runs=Count("id"),
+            avg_duration=Avg("duration_seconds"),
+            avg_api_seconds=Avg("api_seconds"),
+            api_calls=Sum("api_calls"),
+            errors=Sum("errors"),
+        )
+        .order_by("-day", "kind")
+    )
+    return render(
+        request,
+        "etsy/sync_runs.html",
+        {
+            "runs": runs[:SYNC_RUN_LIST_SIZE],
+            "trends": trends,
+            "trend_days": SYNC_RUN_TREND_DAYS,
+        },
+    )
@@ -0,0 +1,38 @@
+from core.api import api_view, values_page
+
+from .models import Listing
+
+LISTING_API_FIELDS = {
+    "id": "id",
+    "etsy_listing_id": "etsy_listing_id",
+    "title": "title",
+    "state": "state",
+    "url": "url",
+    "image_url": "image_url",
+    "price_amount": "price_amount",
+    "price_currency": "price_currency",
+    "quantity": "quantity",
+    "updated_at_etsy": "updated_at_etsy",
+    "updated_at": "updated_at",
+}
+LISTING_API_DEFAULT_FIELDS = (
+    "id",
+    "etsy_listing_id",
+    "title",
+    "state",
+    "price_amount",
+    "price_currency",
+    "quantity",
+    "updated_at",
+)
+
+
+@api_view
+def listing_api(request):
+    return values_page(
+        request,
+        Listing.objects.filter(owner=request.user),
+        LISTING_API_FIELDS,
+        LISTING_API_DEFAULT_FIELDS,
+        "updated_at",
+    )
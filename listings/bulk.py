@@ -0,0 +1,212 @@
+import asyncio
+import csv
+import io
+
+import httpx
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.utils import timezone
+
+from core.conditional import bump_data_version
+from etsy.client import EtsyClient
+from etsy.models import EtsyAccount
+
+from .models import Listing
+
+BULK_EDIT_LIMIT = 500
+BULK_EDIT_FIELDS = ("quantity", "price_amount")
+# price_amount Etsy Money.amount degeridir (divisor 100); envanter PUT'u ondalik fiyat ister.
+PRICE_DIVISOR = 100
+
+
+class BulkEditError(ValueError):
+    pass
+
+
+def _parse_int(raw, label):
+    raw = (raw or "").strip()
+    if not raw:
+        return None
+    try:
+        value = int(raw)
+    except ValueError:
+        raise BulkEditError(f"{label} tam sayi olmali: {raw}") from None
+    if value < 0:
+        raise BulkEditError(f"{label} negatif olamaz: {raw}")
+    return value
+
+
+def _add_change(changes, listing_id, quantity, price_amount):
+    change = {
+        field: value
+        for field, value in (("quantity", quantity), ("price_amount", price_amount))
+        if value is not None
+    }
+    if change:
+        changes[listing_id] = change
+
+
+# Listing export'u ile ayni kolonlar (etsy_listing_id, quantity, price_amount); gerisi yok sayilir.
+def parse_bulk_csv(uploaded):
+    reader = csv.DictReader(io.TextIOWrapper(uploaded, encoding="utf-8-sig"))
+    # Dosya satir satir cozulur; kodlama hatasi okuma sirasinda da cikabilir.
+    try:
+        return _parse_csv_rows(reader)
+    except (UnicodeDecodeError, csv.Error) as exc:
+        raise BulkEditError(f"CSV okunamadi (UTF-8 CSV olmali): {exc}") from None
+
+
+def _parse_csv_rows(reader):
+    changes = {}
+    errors = []
+    if "etsy_listing_id" not in (reader.fieldnames or []):
+        raise BulkEditError("CSV'de etsy_listing_id kolonu yok.")
+    for line, row in enumerate(reader, start=2):
+        try:
+            listing_id = _parse_int(row.get("etsy_listing_id"), "etsy_listing_id")
+            if listing_id is None:
+                continue
+            _add_change(
+                changes,
+                listing_id,
+                _parse_int(row.get("quantity"), "quantity"),
+                _parse_int(row.get("price_amount"), "price_amount"),
+            )
+        except BulkEditError as exc:
+            errors.append(f"Satir {line}: {exc}")
+    return changes, errors
+
+
+# Grid formu: quantity-<etsy_listing_id> / price_amount-<etsy_listing_id> alanlari.
+def parse_bulk_grid(data):
+    changes = {}
+    errors = []
+    listing_ids = set()
+    for key in data:
+        field, _, raw_id = key.partition("-")
+        if field in BULK_EDIT_FIELDS and raw_id:
+            listing_ids.add(raw_id)
+    for raw_id in sorted(listing_ids):
+        try:
+            _add_change(
+                changes,
+                _parse_int(raw_id, "etsy_listing_id"),
+                _parse_int(data.get(f"quantity-{raw_id}"), "quantity"),
+                _parse_int(data.get(f"price_amount-{raw_id}"), "price_amount"),
+            )
+        except BulkEditError as exc:
+            errors.append(f"Listing {raw_id}: {exc}")
+    return changes, errors
+
+
+# Sadece hesabin listing'leri ve gercekten degisen alanlar Etsy'ye gider.
+def pending_changes(user, changes):
+    current = {
+        row["etsy_listing_id"]: row
+        for row in Listing.objects.filter(owner=user, etsy_listing_id__in=list(changes)).values(
+            "etsy_listing_id", *BULK_EDIT_FIELDS
+        )
+    }
+    pending = {}
+    unknown = []
+    for listing_id, change in changes.items():
+        row = current.get(listing_id)
+        if row is None:
+            unknown.append(listing_id)
+            continue
+        change = {field: value for field, value in change.items() if row[field] != value}
+        if change:
+            pending[listing_id] = change
+    return pending, unknown
+
+
+def inventory_payload(inventory, change):
+    products = inventory.get("products") or []
+    if len(products) != 1 or len(products[0].get("offerings") or []) != 1:
+        raise BulkEditError("Varyasyonlu listing'ler toplu duzenlemede desteklenmiyor.")
+    product = products[0]
+    offering = product["offerings"][0]
+    price = offering.get("price") or {}
+    price_amount = change.get("price_amount", price.get("amount"))
+    if price_amount is None:
+        raise BulkEditError("Etsy envanterinde fiyat yok.")
+    divisor = price.get("divisor") or PRICE_DIVISOR
+    new_offering = {
+        "price": price_amount / divisor,
+        "quantity": change.get("quantity", offering.get("quantity")),
+        "is_enabled": offering.get("is_enabled", True),
+    }
+    if offering.get("readiness_state_id"):
+        new_offering["readiness_state_id"] = offering["readiness_state_id"]
+    return {
+        "products": [
+            {
+                "sku": product.get("sku", ""),
+                "property_values": product.get("property_values") or [],
+                "offerings": [new_offering],
+            }
+        ],
+        "price_on_property": inventory.get("price_on_property") or [],
+        "quantity_on_property": inventory.get("quantity_on_property") or [],
+        "sku_on_property": inventory.get("sku_on_property") or [],
+    }
+
+
+def _applied_values(inventory):
+    offering = inventory["products"][0]["offerings"][0]
+    return {
+        "quantity": offering.get("quantity"),
+        "price_amount": (offering.get("price") or {}).get("amount"),
+    }
+
+
+async def push_listing_changes(client, changes, concurrency):
+    # Etsy'ye ayni anda en fazla `concurrency` listing; her listing icin envanter GET + PUT.
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def push(http, listing_id, change):
+        async with semaphore:
+            try:
+                inventory = await client.aget_listing_inventory(http, listing_id)
+                updated = await client.aupdate_listing_inventory(
+                    http, listing_id, inventory_payload(inventory, change)
+                )
+                values = _applied_values(updated)
+            except BulkEditError as exc:
+                return {"etsy_listing_id": listing_id, "ok": False, "error": str(exc)}
+            except httpx.HTTPStatusError as exc:
+                error = f"Etsy HTTP {exc.response.status_code}"
+                return {"etsy_listing_id": listing_id, "ok": False, "error": error}
+            except httpx.HTTPError as exc:
+                return {"etsy_listing_id": listing_id, "ok": False, "error": str(exc)}
+            except (KeyError, IndexError, TypeError, AttributeError, ValueError):
+                # PUT uygulanmis olabilir; listing bir sonraki sync'te duzelir.
+                error = "Etsy beklenmeyen envanter cevabi dondurdu."
+                return {"etsy_listing_id": listing_id, "ok": False, "error": error}
+        return {"etsy_listing_id": listing_id, "ok": True, "values": values}
+
+    async with httpx.AsyncClient(timeout=20) as http:
+        return await asyncio.gather(
+            *(push(http, listing_id, change) for listing_id, change in changes.items())
+        )
+
+
+def apply_bulk_edit(user, changes):
+    account = EtsyAccount.objects.get(user=user)
+    client = EtsyClient(account.access_token)
+    results = async_to_sync(push_listing_changes)(
+        client, changes, settings.ETSY_BULK_EDIT_CONCURRENCY
+    )
+
+    # Basarili olanlar Etsy'nin dondurdugu degerlerle tek bulk_update'te yazilir.
+    applied = {result["etsy_listing_id"]: result["values"] for result in results if result["ok"]}
+    if applied:
+        now = timezone.now()
+        listings = list(Listing.objects.filter(owner=user, etsy_listing_id__in=list(applied)))
+        for listing in listings:
+            for field, value in applied[listing.etsy_listing_id].items():
+                setattr(listing, field, value)
+            listing.updated_at = now
+        Listing.objects.bulk_update(listings, [*BULK_EDIT_FIELDS, "updated_at"])
+        bump_data_version(user.id, "listings")
+    return results
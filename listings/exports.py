@@ -0,0 +1,23 @@
+from .models import Listing
+
+LISTING_EXPORT_FIELDS = tuple(
+    (field, field)
+    for field in (
+        "etsy_listing_id",
+        "title",
+        "state",
+        "url",
+        "quantity",
+        "price_amount",
+        "price_currency",
+        "updated_at_etsy",
+    )
+)
+
+
+def listing_export_rows(user):
+    return (
+        Listing.objects.filter(owner=user)
+        .order_by("id")
+        .values(*[field for field, _ in LISTING_EXPORT_FIELDS])
+    )
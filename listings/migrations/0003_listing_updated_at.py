@@ -0,0 +1,26 @@
+# Generated by Django 6.0 on 2026-10-19 16:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("listings", "0002_listing_image_url"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="listing",
+            name="updated_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="listing",
+            index=models.Index(
+                fields=["owner", "updated_at"], name="listings_listing_updated_idx"
+            ),
+        ),
+    ]
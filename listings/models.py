@@ -15,6 +15,13 @@ class Listing(models.Model):
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
 
     updated_at_etsy = models.DateTimeField(null=True, blank=True)
+    # Sync'te bir alan degistiginde set edilir; API'nin updated_since filtresi bunu kullanir.
+    updated_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["owner", "updated_at"], name="listings_listing_updated_idx"),
+        ]
 
     def __str__(self):
         return f"{self.etsy_listing_id} - {self.title}"
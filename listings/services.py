@@ -1,8 +1,27 @@
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from core.conditional import bump_data_version
 from etsy.client import EtsyClient
 from etsy.models import EtsyAccount
+from etsy.progress import sync_phase
+from orders.models import OrderItem
 from .models import Listing
 
-def sync_active_listings(user):
+LISTING_SYNC_FIELDS = (
+    "owner_id",
+    "title",
+    "state",
+    "url",
+    "image_url",
+    "quantity",
+    "price_amount",
+    "price_currency",
+)
+
+
+def sync_active_listings(user, progress=None):
     account = EtsyAccount.objects.get(user=user)
     client = EtsyClient(account.access_token)
 
@@ -42,7 +61,11 @@ def sync_active_listings(user):
         items = payload.get("results", [])
         if not items:
             break
+        if progress:
+            progress.add("pages")
 
+        # Gorseller once cekilir; yazmalar sayfa basina tek transaction'da yapilir.
+        image_urls = {}
         for it in items:
             image_url = ""
             try:
@@ -52,22 +75,67 @@ def sync_active_listings(user):
                     image_url = image_results[0].get("url_170x135", "")
             except Exception:
                 image_url = ""
+                if progress:
+                    progress.error(f"Listing {it['listing_id']} gorselleri alinamadi.")
+            image_urls[it["listing_id"]] = image_url
 
-            Listing.objects.update_or_create(
-                etsy_listing_id=it["listing_id"],
-                defaults={
-                    "owner": user,
+        existing = {
+            row["etsy_listing_id"]: row
+            for row in Listing.objects.filter(
+                etsy_listing_id__in=[it["listing_id"] for it in items]
+            ).values("etsy_listing_id", *LISTING_SYNC_FIELDS)
+        }
+
+        with sync_phase(progress, "database"), transaction.atomic():
+            inserted = []
+            for it in items:
+                values = {
+                    "owner_id": user.id,
                     "title": it.get("title", ""),
                     "state": it.get("state", ""),
                     "url": it.get("url", ""),
-                    "image_url": image_url,
+                    "image_url": image_urls[it["listing_id"]],
                     "quantity": it.get("quantity"),
                     "price_amount": (it.get("price") or {}).get("amount"),
                     "price_currency": (it.get("price") or {}).get("currency_code", ""),
-                },
-            )
-            total += 1
+                }
+                current = existing.get(it["listing_id"])
+                if current is None:
+                    outcome = "inserted"
+                elif any(current[field] != value for field, value in values.items()):
+                    outcome = "updated"
+                else:
+                    outcome = "unchanged"
+                # Degismeyen listing'ler icin yazma yapilmaz.
+                if outcome != "unchanged":
+                    Listing.objects.update_or_create(
+                        etsy_listing_id=it["listing_id"],
+                        defaults={**values, "updated_at": timezone.now()},
+                    )
+                total += 1
+                if outcome == "inserted":
+                    inserted.append(it["listing_id"])
+                if progress:
+                    progress.add("records")
+                    progress.add(outcome)
+            if inserted:
+                link_order_items(user, inserted)
+            # Her commit edilen sayfa surumu artirir; sync sonradan hata alsa da 304'ler bayatlamaz.
+            transaction.on_commit(lambda: bump_data_version(user.id, "listings"))
 
         offset += limit
 
     return total
+
+
+# Listing'inden once senkronlanan siparis urunlerini yeni listing'lere tek UPDATE ile baglar.
+def link_order_items(user, etsy_listing_ids):
+    return OrderItem.objects.filter(
+        order__owner=user, listing__isnull=True, etsy_listing_id__in=etsy_listing_ids
+    ).update(
+        listing=Subquery(
+            Listing.objects.filter(
+                owner=user, etsy_listing_id=OuterRef("etsy_listing_id")
+            ).values("id")[:1]
+        )
+    )
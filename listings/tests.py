@@ -1,3 +1,207 @@
+import asyncio
+import io
+from unittest import mock
+
+import httpx
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from etsy.client import EtsyClient
+from etsy.models import EtsyAccount
+from orders.models import DailyListingRollup
+
+from .bulk import (
+    BulkEditError,
+    apply_bulk_edit,
+    inventory_payload,
+    parse_bulk_csv,
+    parse_bulk_grid,
+    pending_changes,
+)
+from .models import Listing
+
+
+def inventory(quantity=1, amount=1000, products=1):
+    offering = {
+        "price": {"amount": amount, "divisor": 100, "currency_code": "USD"},
+        "quantity": quantity,
+        "is_enabled": True,
+    }
+    return {
+        "products": [
+            {"sku": "", "property_values": [], "offerings": [offering]} for _ in range(products)
+        ],
+        "price_on_property": [],
+        "quantity_on_property": [],
+        "sku_on_property": [],
+    }
+
+
+class FakeEtsyClient:
+    # Etsy envanter uclarinin yerine; PUT edilen degerleri geri dondurur.
+    variations = set()
+    broken = set()
+    puts = {}
+
+    def __init__(self, access_token):
+        pass
+
+    async def aget_listing_inventory(self, http, listing_id):
+        return inventory(products=2 if listing_id in self.variations else 1)
+
+    async def aupdate_listing_inventory(self, http, listing_id, payload):
+        self.puts[listing_id] = payload
+        if listing_id in self.broken:
+            return {"products": []}
+        offering = payload["products"][0]["offerings"][0]
+        return inventory(offering["quantity"], round(offering["price"] * 100))
+
+
+class BulkParseTests(TestCase):
+    def test_csv_uses_export_columns_and_skips_empty_cells(self):
+        upload = io.BytesIO(
+            b"etsy_listing_id,title,quantity,price_amount\n1,a,5,1250\n2,b,,990\n3,c,,\n"
+        )
+        changes, errors = parse_bulk_csv(upload)
+        self.assertEqual(errors, [])
+        self.assertEqual(
+            changes, {1: {"quantity": 5, "price_amount": 1250}, 2: {"price_amount": 990}}
+        )
+
+    def test_csv_reports_invalid_rows(self):
+        changes, errors = parse_bulk_csv(io.BytesIO(b"etsy_listing_id,quantity\n1,x\n2,-1\n3,4\n"))
+        self.assertEqual(changes, {3: {"quantity": 4}})
+        self.assertEqual(len(errors), 2)
+
+    def test_csv_rejects_non_utf8_and_missing_column(self):
+        with self.assertRaises(BulkEditError):
+            parse_bulk_csv(io.BytesIO("etsy_listing_id,quantity\n1,5\n".encode("utf-16")))
+        with self.assertRaises(BulkEditError):
+            parse_bulk_csv(io.BytesIO(b"id,quantity\n1,5\n"))
+
+    def test_grid(self):
+        changes, errors = parse_bulk_grid(
+            {"quantity-1": "3", "price_amount-1": "", "price_amount-2": "500", "csrf": "x"}
+        )
+        self.assertEqual(errors, [])
+        self.assertEqual(changes, {1: {"quantity": 3}, 2: {"price_amount": 500}})
+
+    def test_variations_are_rejected(self):
+        with self.assertRaises(BulkEditError):
+            inventory_payload(inventory(products=2), {"quantity": 1})
+        payload = inventory_payload(inventory(), {"price_amount": 1250})
+        self.assertEqual(payload["products"][0]["offerings"][0]["price"], 12.5)
+
+
+class BulkEditTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user("seller", password="x")
+        other = User.objects.create_user("other", password="x")
+        EtsyAccount.objects.create(user=self.user, access_token="token")
+        for listing_id in (1, 2, 3, 4):
+            Listing.objects.create(
+                owner=self.user, etsy_listing_id=listing_id, quantity=1, price_amount=1000
+            )
+        Listing.objects.create(owner=other, etsy_listing_id=9, quantity=1, price_amount=1000)
+        FakeEtsyClient.variations = set()
+        FakeEtsyClient.broken = set()
+        FakeEtsyClient.puts = {}
+
+    def test_pending_changes_only_owned_and_changed(self):
+        pending, unknown = pending_changes(
+            self.user,
+            {
+                1: {"quantity": 1, "price_amount": 1500},
+                2: {"quantity": 1},
+                9: {"quantity": 5},
+                77: {"quantity": 5},
+            },
+        )
+        self.assertEqual(pending, {1: {"price_amount": 1500}})
+        self.assertEqual(sorted(unknown), [9, 77])
+
+    def test_apply_writes_back_successes_only(self):
+        FakeEtsyClient.variations = {2}
+        FakeEtsyClient.broken = {3}
+        changes = {1: {"quantity": 7}, 2: {"quantity": 7}, 3: {"quantity": 7}, 4: {"quantity": 8}}
+        with mock.patch("listings.bulk.EtsyClient", FakeEtsyClient):
+            results = apply_bulk_edit(self.user, changes)
+
+        by_id = {result["etsy_listing_id"]: result for result in results}
+        self.assertTrue(by_id[1]["ok"])
+        self.assertTrue(by_id[4]["ok"])
+        self.assertFalse(by_id[2]["ok"])
+        self.assertFalse(by_id[3]["ok"])
+        self.assertNotIn(2, FakeEtsyClient.puts)
+        quantities = dict(Listing.objects.values_list("etsy_listing_id", "quantity"))
+        self.assertEqual(quantities, {1: 7, 2: 1, 3: 1, 4: 8, 9: 1})
+        self.assertIsNotNone(Listing.objects.get(etsy_listing_id=1).updated_at)
+
+    def test_grid_post_sends_only_changed_listings(self):
+        self.client.force_login(self.user)
+        with mock.patch("listings.bulk.EtsyClient", FakeEtsyClient):
+            response = self.client.post(
+                "/listings/bulk/",
+                {"quantity-1": "1", "price_amount-1": "1000", "quantity-2": "4"},
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(FakeEtsyClient.puts), [2])
+        self.assertEqual(Listing.objects.get(etsy_listing_id=2).quantity, 4)
+
+    def test_csv_upload_with_bad_encoding_shows_error(self):
+        self.client.force_login(self.user)
+        upload = SimpleUploadedFile("e.csv", "etsy_listing_id,quantity\n1,5\n".encode("utf-16"))
+        response = self.client.post("/listings/bulk/", {"csv": upload})
+        self.assertRedirects(response, "/listings/bulk/", fetch_redirect_response=False)
+
+
+class EtsyClientRateLimitTests(TestCase):
+    def test_429_is_retried_after_retry_after(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request.method)
+            if len(calls) == 1:
+                return httpx.Response(429, headers={"Retry-After": "2"})
+            return httpx.Response(200, json=inventory())
+
+        async def fetch():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+                return await EtsyClient("token").aget_listing_inventory(http, 1)
+
+        sleep = mock.AsyncMock()
+        with mock.patch.object(asyncio, "sleep", sleep):
+            data = async_to_sync(fetch)()
+        self.assertEqual(data["products"][0]["offerings"][0]["quantity"], 1)
+        self.assertEqual(calls, ["GET", "GET"])
+        sleep.assert_awaited_once_with(2.0)
+
+
+class ListingsHomeSalesTests(TestCase):
+    def test_month_revenue_is_decimal_in_sold_currency(self):
+        user = get_user_model().objects.create_user("seller", password="x")
+        Listing.objects.create(
+            owner=user, etsy_listing_id=1, title="Mug", price_amount=2500, price_currency="EUR"
+        )
+        today = timezone.localdate()
+        for currency, units, revenue in (("USD", 1, 1999), ("GBP", 2, 3000)):
+            DailyListingRollup.objects.create(
+                owner=user,
+                day=today,
+                etsy_listing_id=1,
+                currency=currency,
+                units=units,
+                revenue=revenue,
+            )
 
-# Create your tests here.
+        self.client.force_login(user)
+        response = self.client.get(reverse("listings_home"))
+        self.assertContains(response, "19.99 USD")
+        self.assertContains(response, "30.00 GBP")
+        self.assertNotContains(response, "EUR")
+        self.assertContains(response, '<span class="fw-semibold">3</span> sold', html=False)
@@ -1,6 +1,10 @@
 from django.urls import path
-from .views import ListingsHomeView
+from .api import listing_api
+from .views import ListingsBulkEditView, ListingsExportView, ListingsHomeView
 
 urlpatterns = [
     path("", ListingsHomeView.as_view(), name="listings_home"),
+    path("export/", ListingsExportView.as_view(), name="listings_export"),
+    path("bulk/", ListingsBulkEditView.as_view(), name="listings_bulk_edit"),
+    path("api/", listing_api, name="listings_api"),
 ]
@@ -1,22 +1,189 @@
+from asgiref.sync import sync_to_async
 from django.contrib import messages
-from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.decorators import login_required
+from django.core.paginator import Paginator
+from django.db.models import Max, Q, Sum
+from django.http import HttpResponseBadRequest
 from django.shortcuts import render, redirect
+from django.utils import timezone
+from django.utils.decorators import method_decorator
 from django.views import View
+from django.views.decorators.gzip import gzip_page
 
+from core.conditional import conditional_page
+from core.exports import EXPORT_CONTENT_TYPES, aexport_chunks, streaming_export_response
+from etsy.leases import SyncAlreadyRunning, acquire_sync_lease, already_running_response
+from etsy.progress import SyncProgress
+from orders.models import DailyListingRollup
+
+from .bulk import (
+    BULK_EDIT_LIMIT,
+    PRICE_DIVISOR,
+    BulkEditError,
+    apply_bulk_edit,
+    parse_bulk_csv,
+    parse_bulk_grid,
+    pending_changes,
+)
+from .exports import LISTING_EXPORT_FIELDS, listing_export_rows
 from .models import Listing
 from .services import sync_active_listings
 
-class ListingsHomeView(LoginRequiredMixin, View):
+@method_decorator(login_required, name="get")
+@method_decorator(gzip_page, name="get")
+@method_decorator(conditional_page("listings", "orders"), name="get")
+@method_decorator(login_required, name="post")
+class ListingsHomeView(View):
     template_name = "listings/home.html"
 
-    def get(self, request):
-        qs = Listing.objects.filter(owner=request.user).order_by("-id")
-        return render(request, self.template_name, {"listings": qs})
+    async def get(self, request):
+        user = await request.auser()
+        qs = Listing.objects.filter(owner=user).order_by("-id")
+        listings = [listing async for listing in qs]
+
+        # Satis ozeti gunluk rollup'tan tek gruplu sorguyla; kart basina sorgu yok.
+        month_start = timezone.localdate().replace(day=1)
+        # Ciro satilan urunlerin para birimine gore ayri tutulur (listing fiyati degismis olabilir).
+        rows = DailyListingRollup.objects.filter(owner=user).values("etsy_listing_id", "currency")
+        rows = rows.annotate(
+            month_units=Sum("units", filter=Q(day__gte=month_start)),
+            month_revenue=Sum("revenue", filter=Q(day__gte=month_start)),
+            last_sold=Max("day", filter=Q(units__gt=0)),
+        ).order_by("etsy_listing_id", "currency")
+        sales_by_listing = {}
+        async for row in rows:
+            sales = sales_by_listing.setdefault(
+                row["etsy_listing_id"], {"month_units": 0, "month_revenue": [], "last_sold": None}
+            )
+            sales["month_units"] += row["month_units"] or 0
+            if row["month_revenue"]:
+                # Rollup Etsy Money.amount tutar (divisor 100); ekranda ondalik gosterilir.
+                sales["month_revenue"].append(
+                    {"amount": row["month_revenue"] / PRICE_DIVISOR, "currency": row["currency"]}
+                )
+            if row["last_sold"]:
+                sales["last_sold"] = max(sales["last_sold"] or row["last_sold"], row["last_sold"])
+        for listing in listings:
+            listing.sales = sales_by_listing.get(listing.etsy_listing_id)
+        # Context processor'lar (user, messages) session'a senkron erisir.
+        return await sync_to_async(render)(request, self.template_name, {"listings": listings})
+
+    async def post(self, request):
+        return await sync_to_async(self._sync)(request)
+
+    def _sync(self, request):
+        run_id = request.POST.get("run", "")
+        try:
+            lease = acquire_sync_lease(request.user.id, "listings", run_id)
+        except SyncAlreadyRunning as running:
+            return already_running_response(
+                request, running, "Listing sync is already running.", "listings_home"
+            )
 
-    def post(self, request):
+        progress = SyncProgress(request.user.id, "listings", run_id, lease=lease)
         try:
-            count = sync_active_listings(request.user)
+            count = sync_active_listings(request.user, progress=progress)
+            progress.finish()
             messages.success(request, f"Synced {count} active listings from Etsy.")
         except Exception as e:
+            progress.finish("error", str(e))
             messages.error(request, f"Sync failed: {e}")
+        finally:
+            lease.release()
         return redirect("listings_home")
+
+
+@method_decorator(login_required, name="get")
+@method_decorator(login_required, name="post")
+class ListingsBulkEditView(View):
+    template_name = "listings/bulk_edit.html"
+    # Sayfa basina 2 input; DATA_UPLOAD_MAX_NUMBER_FIELDS (1000) altinda kalir.
+    grid_page_size = 200
+
+    async def get(self, request):
+        user = await request.auser()
+        return await sync_to_async(self._render)(request, user)
+
+    async def post(self, request):
+        return await sync_to_async(self._apply)(request)
+
+    def _render(self, request, user, results=None):
+        listings = Listing.objects.filter(owner=user).order_by("title", "id")
+        listings = listings.values(
+            "etsy_listing_id", "title", "quantity", "price_amount", "price_currency"
+        )
+        context = {
+            "page_obj": Paginator(listings, self.grid_page_size).get_page(request.GET.get("page")),
+            "results": results,
+            "limit": BULK_EDIT_LIMIT,
+        }
+        return render(request, self.template_name, context)
+
+    def _apply(self, request):
+        try:
+            if request.FILES.get("csv"):
+                changes, errors = parse_bulk_csv(request.FILES["csv"])
+            else:
+                changes, errors = parse_bulk_grid(request.POST)
+        except BulkEditError as exc:
+            messages.error(request, str(exc))
+            return redirect("listings_bulk_edit")
+        for error in errors:
+            messages.error(request, error)
+        if errors:
+            return redirect("listings_bulk_edit")
+
+        changes, unknown = pending_changes(request.user, changes)
+        if unknown:
+            messages.warning(request, f"{len(unknown)} listing bulunamadi, atlandi.")
+        if not changes:
+            messages.info(request, "Degisiklik yok.")
+            return redirect("listings_bulk_edit")
+        if len(changes) > BULK_EDIT_LIMIT:
+            messages.error(
+                request, f"Tek seferde en fazla {BULK_EDIT_LIMIT} listing guncellenebilir."
+            )
+            return redirect("listings_bulk_edit")
+
+        # Listing sync ile ayni anda calismaz; Etsy'den gelen degerler birbirini ezmesin.
+        try:
+            lease = acquire_sync_lease(request.user.id, "listings")
+        except SyncAlreadyRunning as running:
+            return already_running_response(
+                request, running, "Listing sync is already running.", "listings_bulk_edit"
+            )
+        try:
+            results = apply_bulk_edit(request.user, changes)
+        finally:
+            lease.release()
+
+        titles = dict(
+            Listing.objects.filter(
+                owner=request.user, etsy_listing_id__in=list(changes)
+            ).values_list("etsy_listing_id", "title")
+        )
+        for result in results:
+            result["title"] = titles.get(result["etsy_listing_id"], "")
+            result["change"] = changes[result["etsy_listing_id"]]
+        succeeded = sum(result["ok"] for result in results)
+        if succeeded:
+            messages.success(request, f"{succeeded} listing Etsy'de guncellendi.")
+        if succeeded < len(results):
+            messages.error(request, f"{len(results) - succeeded} listing guncellenemedi.")
+        return self._render(request, request.user, results)
+
+
+@method_decorator(login_required, name="get")
+class ListingsExportView(View):
+    async def get(self, request):
+        export_format = request.GET.get("format", "csv")
+        if export_format not in EXPORT_CONTENT_TYPES:
+            return HttpResponseBadRequest("Unsupported format")
+
+        user = await request.auser()
+        rows = listing_export_rows(user).aiterator(chunk_size=2000)
+        return streaming_export_response(
+            export_format,
+            "listings",
+            aexport_chunks(export_format, LISTING_EXPORT_FIELDS, rows),
+        )
@@ -1,7 +1,57 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils.functional import cached_property
+from django.utils.html import format_html
+
+from core.api import API_MAX_INT
 
 from .models import Order, OrderItem, Shipment
 
+# Bu satir sayisinin uzerinde filtresiz changelist COUNT(*) yerine tahmin kullanir.
+ESTIMATED_COUNT_THRESHOLD = 100_000
+SEARCH_RESULT_LIMIT = 1000
+
+
+def estimate_row_count(model):
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            # ANALYZE sonrasi sqlite_stat1 satirlarinin ilk sayisi indeksteki satir sayisidir;
+            # kismi indeksler daha az sayar, en buyugu tabloya en yakin olandir.
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+            )
+            if cursor.fetchone():
+                cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s", [table])
+                counts = [int(stat.split()[0]) for (stat,) in cursor.fetchall() if stat]
+                if counts:
+                    return max(counts)
+        cursor.execute(
+            f"SELECT MAX({connection.ops.quote_name(model._meta.pk.column)}) "
+            f"FROM {connection.ops.quote_name(table)}"
+        )
+        row = cursor.fetchone()
+    return row[0] if row and row[0] else None
+
+
+class EstimatedCountPaginator(Paginator):
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, "query", None)
+        if query is not None and not query.where:
+            estimate = estimate_row_count(self.object_list.model)
+            if estimate and estimate > ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
+
+
+def _prefix_q(field, term):
+    # LIKE yerine aralik sorgusu: duz B-tree indeksi kullanilabilir.
+    return Q(**{f"{field}__gte": term, f"{field}__lt": term + "\U0010ffff"})
+
 
 class OrderItemInline(admin.TabularInline):
     model = OrderItem
@@ -17,5 +67,46 @@ class ShipmentInline(admin.StackedInline):
 class OrderAdmin(admin.ModelAdmin):
     list_display = ("etsy_order_id", "buyer_name", "status", "owner", "last_synced_at")
     list_filter = ("status",)
-    search_fields = ("etsy_order_id", "buyer_name", "buyer_email")
+    list_select_related = ("owner",)
+    list_per_page = 50
+    ordering = ("-id",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    search_fields = ("etsy_order_id",)
+    search_help_text = "Etsy order id (tam), takip numarasi veya alici adi (on ek)."
+    autocomplete_fields = ("owner",)
+    readonly_fields = ("related_records",)
     inlines = (OrderItemInline, ShipmentInline)
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+
+        order_ids = list(
+            Shipment.objects.filter(_prefix_q("tracking_number", term)).values_list(
+                "order_id", flat=True
+            )[:SEARCH_RESULT_LIMIT]
+        )
+        queryset = queryset.annotate(buyer_name_lower=Lower("buyer_name"))
+        condition = Q(id__in=order_ids) | _prefix_q("buyer_name_lower", term.lower())
+        # isdigit() "²" gibi karakterleri de kabul eder; int() + SQLite INTEGER araligi kontrolu.
+        try:
+            etsy_order_id = int(term)
+        except ValueError:
+            etsy_order_id = None
+        if etsy_order_id is not None and 0 <= etsy_order_id <= API_MAX_INT:
+            condition |= Q(etsy_order_id=etsy_order_id)
+        return queryset.filter(condition), False
+
+    def get_inlines(self, request, obj):
+        # Urun ve kargo inline'lari sadece istendiginde yuklenir.
+        if obj is None or request.GET.get("inlines") != "1":
+            return ()
+        return super().get_inlines(request, obj)
+
+    @admin.display(description="Urunler ve kargo")
+    def related_records(self, obj):
+        if not obj or not obj.pk:
+            return "-"
+        return format_html('<a href="?inlines=1">Urunleri ve kargo kaydini goster</a>')
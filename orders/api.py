@@ -0,0 +1,105 @@
+from core.api import api_view, values_page
+
+from .models import Order, OrderItem, Shipment
+
+# API alan adi -> ORM lookup; fields= parametresi sadece bu adlari kabul eder.
+ORDER_API_FIELDS = {
+    "id": "id",
+    "etsy_order_id": "etsy_order_id",
+    "status": "status",
+    "archived": "archived",
+    "buyer_name": "buyer_name",
+    "buyer_email": "buyer_email",
+    "total_amount": "total_amount",
+    "currency": "currency",
+    "order_created_at": "order_created_at",
+    "expected_ship_date": "expected_ship_date",
+    "shipped_at": "shipped_at",
+    "delivered_at": "delivered_at",
+    "closed_at": "closed_at",
+    "archived_at": "archived_at",
+    "updated_at": "updated_at",
+}
+ORDER_API_DEFAULT_FIELDS = (
+    "id",
+    "etsy_order_id",
+    "status",
+    "archived",
+    "total_amount",
+    "currency",
+    "order_created_at",
+    "updated_at",
+)
+
+ORDER_ITEM_API_FIELDS = {
+    "id": "id",
+    "order_id": "order_id",
+    "etsy_order_id": "order__etsy_order_id",
+    "etsy_listing_id": "etsy_listing_id",
+    "title": "title",
+    "quantity": "quantity",
+    "price_amount": "price_amount",
+    "price_currency": "price_currency",
+}
+ORDER_ITEM_API_DEFAULT_FIELDS = (
+    "id",
+    "order_id",
+    "etsy_listing_id",
+    "quantity",
+    "price_amount",
+    "price_currency",
+)
+
+SHIPMENT_API_FIELDS = {
+    "id": "id",
+    "order_id": "order_id",
+    "etsy_order_id": "order__etsy_order_id",
+    "tracking_number": "tracking_number",
+    "carrier_name": "carrier_name",
+    "carrier_status": "carrier_status",
+    "shipped_at": "shipped_at",
+    "delivered_at": "delivered_at",
+    "last_checked_at": "last_checked_at",
+}
+SHIPMENT_API_DEFAULT_FIELDS = (
+    "id",
+    "order_id",
+    "tracking_number",
+    "carrier_name",
+    "carrier_status",
+    "delivered_at",
+)
+
+
+@api_view
+def order_api(request):
+    return values_page(
+        request,
+        Order.objects.filter(owner=request.user),
+        ORDER_API_FIELDS,
+        ORDER_API_DEFAULT_FIELDS,
+        "updated_at",
+    )
+
+
+# Urun ve gonderi degisiklikleri siparisin updated_at'ini gunceller; updated_since ona bakar.
+@api_view
+def order_item_api(request):
+    return values_page(
+        request,
+        OrderItem.objects.filter(order__owner=request.user),
+        ORDER_ITEM_API_FIELDS,
+        ORDER_ITEM_API_DEFAULT_FIELDS,
+        "order__updated_at",
+    )
+
+
+@api_view
+def shipment_api(request):
+    return values_page(
+        request,
+        Shipment.objects.filter(order__owner=request.user),
+        SHIPMENT_API_FIELDS,
+        SHIPMENT_API_DEFAULT_FIELDS,
+        "order__updated_at",
+    )
@@ -0,0 +1,127 @@
+import gc
+import json
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+from django.conf import settings
+from django.template.loader import render_to_string
+
+from .models import Order
+from .views import _build_card, _build_step_details, _build_stepper, _decorate_details
+
+# Baseline makineye ozgudur; ayni makinede --save ile kaydedilip repoya eklenir.
+BASELINE_PATH = Path(settings.BASE_DIR) / "benchmarks" / "orders_cards.json"
+# Baseline'dan bu oranin uzerinde yavaslayan olcum regresyon sayilir.
+REGRESSION_THRESHOLD = 0.15
+
+
+def _shipment(order):
+    try:
+        return order.shipment
+    except Order.shipment.RelatedObjectDoesNotExist:
+        return None
+
+
+def _step_details(order):
+    return _build_step_details(order, _shipment(order), order.status, "is-active", "Aktif")
+
+
+def _render_card(card):
+    return render_to_string("orders/_card.html", {"card": card})
+
+
+def card_benchmarks(orders):
+    # Her olcum (ad, hazirlik, kart basina calisan fonksiyon) seklindedir; hazirlik sure disidir.
+    shipments = [_shipment(order) for order in orders]
+    details = [_step_details(order) for order in orders]
+    cards = [_build_card(order) for order in orders]
+    return {
+        "decorate_details": (details, lambda rows: _decorate_details(rows, "Aktif")),
+        "build_step_details": (orders, _step_details),
+        "build_stepper": (list(zip(orders, shipments)), lambda pair: _build_stepper(*pair)),
+        "build_card": (orders, _build_card),
+        "render_card": (cards, _render_card),
+        "build_and_render_card": (orders, lambda order: _render_card(_build_card(order))),
+    }
+
+
+def _time_per_item(inputs, func):
+    started = time.perf_counter()
+    for value in inputs:
+        func(value)
+    return (time.perf_counter() - started) / len(inputs) * 1_000_000
+
+
+def _allocations_per_item(inputs, func):
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        results = [func(value) for value in inputs]
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del results
+    return (after - before) / len(inputs), (peak - before) / len(inputs)
+
+
+def run_card_benchmarks(orders, repeat=5):
+    results = {}
+    for name, (inputs, func) in card_benchmarks(orders).items():
+        func(inputs[0])
+        gc.collect()
+        gc.disable()
+        try:
+            timings = [_time_per_item(inputs, func) for _ in range(repeat)]
+        finally:
+            gc.enable()
+        retained, peak = _allocations_per_item(inputs, func)
+        results[name] = {
+            "median_us": round(statistics.median(timings), 2),
+            "min_us": round(min(timings), 2),
+            "retained_bytes": round(retained),
+            "peak_bytes": round(peak),
+        }
+    return results
+
+
+def run_page_benchmark(orders, repeat=5):
+    # Ana sayfa sablonu, hazir kart fragment'lari ile bir sayfa (ORDER_PAGE_SIZE kart) olarak olculur.
+    fragments = [_render_card(_build_card(order)) for order in orders[: settings.ORDER_PAGE_SIZE]]
+    context = {"order_cards": fragments, "next_cursor": "bench"}
+    render_to_string("orders/home.html", context)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        render_to_string("orders/home.html", context)
+        timings.append((time.perf_counter() - started) * 1_000_000)
+    return {"median_us": round(statistics.median(timings), 2), "min_us": round(min(timings), 2)}
+
+
+def load_baseline(path):
+    path = Path(path)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_baseline(path, results):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    rows = []
+    regressions = []
+    for name, current in results.items():
+        previous = (baseline or {}).get(name)
+        if not previous:
+            rows.append((name, current["median_us"], None, None))
+            continue
+        change = current["median_us"] / previous["median_us"] - 1 if previous["median_us"] else 0
+        rows.append((name, current["median_us"], previous["median_us"], change))
+        if change > threshold:
+            regressions.append(name)
+    return rows, regressions
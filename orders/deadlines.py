@@ -0,0 +1,61 @@
+from datetime import datetime, time, timedelta
+
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import Order
+
+DUE_WEEK_DAYS = 7
+
+
+# Henuz kargolanmamis aktif siparisler; orders_order_due_idx kismi indeksinin kosuluyla ayni.
+def due_queryset(owner=None):
+    queryset = Order.objects.filter(
+        status=Order.Status.RECEIVED, archived=False, expected_ship_date__isnull=False
+    )
+    if owner is not None:
+        queryset = queryset.filter(owner=owner)
+    return queryset
+
+
+def due_windows(now=None):
+    now = now or timezone.now()
+    today = timezone.localdate(now)
+    end_of_today = timezone.make_aware(datetime.combine(today + timedelta(days=1), time.min))
+    return now, end_of_today, end_of_today + timedelta(days=DUE_WEEK_DAYS - 1)
+
+
+# Gecikmis / bugun / bu hafta sayilari tek aggregate sorguda.
+def due_counts(owner, now=None):
+    now, end_of_today, end_of_week = due_windows(now)
+    return due_queryset(owner).aggregate(
+        overdue=Count("id", filter=Q(expected_ship_date__lt=now)),
+        due_today=Count(
+            "id", filter=Q(expected_ship_date__gte=now, expected_ship_date__lt=end_of_today)
+        ),
+        due_week=Count(
+            "id",
+            filter=Q(expected_ship_date__gte=end_of_today, expected_ship_date__lt=end_of_week),
+        ),
+    )
+
+
+def due_bucket(expected_ship_date, now=None):
+    now, end_of_today, end_of_week = due_windows(now)
+    if expected_ship_date < now:
+        return "overdue"
+    if expected_ship_date < end_of_today:
+        return "due_today"
+    if expected_ship_date < end_of_week:
+        return "due_week"
+    return "later"
+
+
+def due_orders(owner, until=None, limit=None):
+    queryset = due_queryset(owner)
+    if until is not None:
+        queryset = queryset.filter(expected_ship_date__lt=until)
+    queryset = queryset.order_by("expected_ship_date", "id").values(
+        "id", "etsy_order_id", "buyer_name", "total_amount", "currency", "expected_ship_date"
+    )
+    return queryset[:limit] if limit else queryset
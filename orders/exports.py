@@ -0,0 +1,32 @@
+from .models import Order
+
+# (kolon adi, ORM lookup) ciftleri; siparis basina her urun bir satir, urunsuz siparis tek satir.
+ORDER_EXPORT_FIELDS = (
+    ("etsy_order_id", "etsy_order_id"),
+    ("status", "status"),
+    ("archived", "archived"),
+    ("buyer_name", "buyer_name"),
+    ("buyer_email", "buyer_email"),
+    ("total_amount", "total_amount"),
+    ("currency", "currency"),
+    ("order_created_at", "order_created_at"),
+    ("expected_ship_date", "expected_ship_date"),
+    ("shipped_at", "shipped_at"),
+    ("delivered_at", "delivered_at"),
+    ("tracking_number", "shipment__tracking_number"),
+    ("carrier_name", "shipment__carrier_name"),
+    ("carrier_status", "shipment__carrier_status"),
+    ("item_listing_id", "items__etsy_listing_id"),
+    ("item_title", "items__title"),
+    ("item_quantity", "items__quantity"),
+    ("item_price_amount", "items__price_amount"),
+    ("item_price_currency", "items__price_currency"),
+)
+
+
+def order_export_rows(user):
+    return (
+        Order.objects.filter(owner=user)
+        .order_by("id", "items__id")
+        .values(*[lookup for _, lookup in ORDER_EXPORT_FIELDS])
+    )
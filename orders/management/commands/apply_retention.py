@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from orders.retention import auto_archive_closed_orders, move_to_cold_storage
+
+
+class Command(BaseCommand):
+    help = "Auto-archive old closed orders and move long-archived orders to cold storage."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--archive-days", type=int, default=settings.ORDER_AUTO_ARCHIVE_DAYS)
+        parser.add_argument("--cold-days", type=int, default=settings.ORDER_COLD_STORAGE_DAYS)
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        archived = auto_archive_closed_orders(options["archive_days"])
+        moved = move_to_cold_storage(options["cold_days"], batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"{archived} order archived, {moved} order moved to cold storage.")
+        )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from orders.services import apply_tracking_updates
+
+
+class Command(BaseCommand):
+    help = "Apply queued Shipentegra tracking pushes to shipments and orders."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            applied = apply_tracking_updates(limit=options["batch_size"])
+            if not applied:
+                break
+            total += applied
+        self.stdout.write(self.style.SUCCESS(f"{total} shipment updated."))
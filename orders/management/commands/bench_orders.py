@@ -0,0 +1,81 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from orders.benchmarks import (
+    BASELINE_PATH,
+    REGRESSION_THRESHOLD,
+    compare,
+    load_baseline,
+    run_card_benchmarks,
+    run_page_benchmark,
+    save_baseline,
+)
+from orders.models import Order
+from orders.synthetic import create_synthetic_orders
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark order card building (_build_stepper, _build_step_details, _decorate_details), "
+        "card/page template rendering and allocations over synthetic orders, and compare "
+        "against a stored baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orders", type=int, default=10000, help="Synthetic order count.")
+        parser.add_argument("--sample", type=int, default=2000, help="Orders measured per run.")
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--baseline", default=str(BASELINE_PATH))
+        parser.add_argument(
+            "--save", action="store_true", help="Store this run as the new baseline."
+        )
+        parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+
+    def handle(self, *args, **options):
+        baseline = load_baseline(options["baseline"])
+        # Baseline yoksa karsilastirma yapilamaz; sessizce gecmek regresyonlari gizler.
+        if baseline is None and not options["save"]:
+            raise CommandError(
+                f"No baseline at {options['baseline']}. Record one on this machine with "
+                f"'python manage.py bench_orders --save' (same --orders/--sample/--seed) "
+                f"and commit it."
+            )
+
+        with transaction.atomic():
+            user = get_user_model().objects.create(username="bench-orders")
+            create_synthetic_orders(user, options["orders"], seed=options["seed"])
+            orders = list(
+                Order.objects.filter(owner=user)
+                .select_related("shipment")
+                .prefetch_related("items")
+                .order_by("id")[: options["sample"]]
+            )
+            results = run_card_benchmarks(orders, options["repeat"])
+            results["render_home_page"] = run_page_benchmark(orders, options["repeat"])
+            transaction.set_rollback(True)
+
+        rows, regressions = compare(results, baseline, options["threshold"])
+
+        self.stdout.write(
+            f"{'benchmark':<24}{'median us':>12}{'baseline':>12}{'change':>9}"
+            f"{'retained B':>12}{'peak B':>10}"
+        )
+        for name, median, previous, change in rows:
+            result = results[name]
+            self.stdout.write(
+                f"{name:<24}{median:>12.2f}"
+                f"{previous if previous is not None else '-':>12}"
+                f"{f'{change:+.1%}' if change is not None else '-':>9}"
+                f"{result.get('retained_bytes', '-'):>12}{result.get('peak_bytes', '-'):>10}"
+            )
+
+        if options["save"]:
+            save_baseline(options["baseline"], results)
+            self.stdout.write(self.style.SUCCESS(f"Baseline saved to {options['baseline']}"))
+        elif regressions:
+            raise CommandError(
+                f"Slower than baseline by more than {options['threshold']:.0%}: "
+                + ", ".join(regressions)
+            )
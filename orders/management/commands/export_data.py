@@ -0,0 +1,42 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from core.exports import EXPORT_CONTENT_TYPES, export_chunks
+from listings.exports import LISTING_EXPORT_FIELDS, listing_export_rows
+from orders.exports import ORDER_EXPORT_FIELDS, order_export_rows
+
+EXPORTS = {
+    "orders": (ORDER_EXPORT_FIELDS, order_export_rows),
+    "listings": (LISTING_EXPORT_FIELDS, listing_export_rows),
+}
+
+
+class Command(BaseCommand):
+    help = "Stream orders (with items and shipment fields) or listings of a user as CSV/NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=sorted(EXPORTS))
+        parser.add_argument("--user", required=True, help="Username of the owner.")
+        parser.add_argument("--format", choices=sorted(EXPORT_CONTENT_TYPES), default="csv")
+        parser.add_argument("--output", help="File path (default: stdout).")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options["user"])
+        except get_user_model().DoesNotExist as exc:
+            raise CommandError(f"User {options['user']!r} not found.") from exc
+
+        fields, rows_for = EXPORTS[options["dataset"]]
+        rows = rows_for(user).iterator(chunk_size=options["chunk_size"])
+        chunks = export_chunks(options["format"], fields, rows)
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as output:
+                for chunk in chunks:
+                    output.write(chunk)
+        else:
+            for chunk in chunks:
+                sys.stdout.write(chunk)
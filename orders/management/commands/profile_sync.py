@@ -0,0 +1,84 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+
+from etsy.models import EtsyAccount
+from listings.services import sync_active_listings
+from orders.profiling import ReplayEtsyClient, load_replay_data, profile_call, replay_ship_status
+from orders.services import sync_orders
+
+TARGETS = {
+    "orders": ("orders.services.EtsyClient", sync_orders),
+    "listings": ("listings.services.EtsyClient", sync_active_listings),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Profile sync_orders or sync_active_listings against recorded or synthetic API data "
+        "(cProfile, tracemalloc, folded stacks) inside a rolled-back transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("target", choices=sorted(TARGETS))
+        parser.add_argument(
+            "--fixture", help="Recorded API responses (JSON) instead of synthetic data."
+        )
+        parser.add_argument("--orders", type=int, default=2000, help="Synthetic receipt count.")
+        parser.add_argument("--listings", type=int, default=1000, help="Synthetic listing count.")
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=1,
+            help="Sync this many times before profiling the last run (2 = unchanged-data path).",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", default="profiles")
+        parser.add_argument("--top", type=int, default=40)
+        parser.add_argument(
+            "--interval", type=float, default=0.005, help="Stack sampling interval."
+        )
+        parser.add_argument(
+            "--no-alloc", action="store_true", help="Skip tracemalloc (it slows the run down)."
+        )
+
+    def handle(self, *args, **options):
+        target = options["target"]
+        client_path, sync = TARGETS[target]
+        receipts, listings, activities = load_replay_data(
+            options["fixture"], options["orders"], options["listings"], options["seed"]
+        )
+        client = ReplayEtsyClient(receipts, listings)
+
+        with (
+            override_settings(
+                CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+            ),
+            mock.patch(client_path, lambda access_token: client),
+            mock.patch(
+                "orders.services.fetch_ship_status", replay_ship_status(activities, options["seed"])
+            ),
+            transaction.atomic(),
+        ):
+            user = get_user_model().objects.create(username="profile-sync")
+            EtsyAccount.objects.create(user=user, access_token="profile", shop_id=1)
+            for _ in range(options["repeat"] - 1):
+                sync(user)
+            total, elapsed, peak, paths = profile_call(
+                lambda: sync(user),
+                options["output"],
+                f"sync_{target}",
+                top=options["top"],
+                sample_interval=options["interval"],
+                allocations=not options["no_alloc"],
+            )
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"sync_{target}: {total} records in {elapsed:.3f}s, peak {peak / 1024:.1f} KiB"
+        )
+        for kind, path in paths.items():
+            self.stdout.write(f"  {kind}: {path}")
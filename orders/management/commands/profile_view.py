@@ -0,0 +1,85 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from orders.profiling import profile_call
+from orders.synthetic import create_synthetic_orders
+from orders.views import _order_page
+
+VIEWS = ("order_list", "order_page")
+
+
+class Command(BaseCommand):
+    help = (
+        "Profile the order list or next-page view over synthetic orders "
+        "(cProfile, tracemalloc, folded stacks) inside a rolled-back transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("view", choices=VIEWS)
+        parser.add_argument("--orders", type=int, default=5000, help="Synthetic order count.")
+        parser.add_argument(
+            "--warm", action="store_true", help="Render once first so card fragments are cached."
+        )
+        parser.add_argument(
+            "--requests", type=int, default=20, help="Requests in the profiled run."
+        )
+        parser.add_argument("--output", default="profiles")
+        parser.add_argument("--top", type=int, default=40)
+        parser.add_argument(
+            "--interval", type=float, default=0.005, help="Stack sampling interval."
+        )
+        parser.add_argument(
+            "--no-alloc", action="store_true", help="Skip tracemalloc (it slows the run down)."
+        )
+
+    def handle(self, *args, **options):
+        with (
+            override_settings(
+                ALLOWED_HOSTS=["testserver"],
+                CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+            ),
+            transaction.atomic(),
+        ):
+            user = get_user_model().objects.create(username="profile-view")
+            create_synthetic_orders(user, options["orders"])
+            client = Client()
+            client.force_login(user)
+
+            if options["view"] == "order_list":
+                url, params = reverse("orders_home"), {}
+            else:
+                _, cursor = _order_page(user)
+                url, params = reverse("orders_page"), {"cursor": cursor}
+
+            def run():
+                # Cold olcumde her istek oncesi cache bosaltilir.
+                for _ in range(options["requests"]):
+                    if not options["warm"]:
+                        cache.clear()
+                    response = client.get(url, params)
+                    if response.status_code != 200:
+                        raise CommandError(f"{url}: HTTP {response.status_code}")
+
+            if options["warm"]:
+                client.get(url, params)
+            name = f"view_{options['view']}_{'warm' if options['warm'] else 'cold'}"
+            _, elapsed, peak, paths = profile_call(
+                run,
+                options["output"],
+                name,
+                top=options["top"],
+                sample_interval=options["interval"],
+                allocations=not options["no_alloc"],
+            )
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"{name}: {options['requests']} requests in {elapsed:.3f}s, peak {peak / 1024:.1f} KiB"
+        )
+        for kind, path in paths.items():
+            self.stdout.write(f"  {kind}: {path}")
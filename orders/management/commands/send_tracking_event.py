@@ -0,0 +1,43 @@
+import json
+
+import httpx
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from orders.shipentegra import WEBHOOK_SIGNATURE_HEADER, sign_webhook_body
+
+
+class Command(BaseCommand):
+    help = "Post a signed sample tracking event to the Shipentegra webhook (local stand-in)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("tracking_number")
+        parser.add_argument("--status", default="IN TRANSIT")
+        parser.add_argument("--event", default="Shipment is on the way")
+        parser.add_argument(
+            "--url",
+            default="http://127.0.0.1:8000/orders/webhooks/shipentegra/",
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now().isoformat()
+        data = {
+            "trackingNumber": options["tracking_number"],
+            "status": options["status"],
+            "activities": [
+                {"date": now, "status": options["status"], "event": options["event"]},
+            ],
+        }
+        if options["status"].upper() == "DELIVERED":
+            data["deliveryDate"] = now
+
+        body = json.dumps({"data": data}).encode("utf-8")
+        headers = {
+            "Content-Type": "application/json",
+            WEBHOOK_SIGNATURE_HEADER: sign_webhook_body(body),
+        }
+        try:
+            response = httpx.post(options["url"], content=body, headers=headers, timeout=20)
+        except httpx.HTTPError as exc:
+            raise CommandError(str(exc)) from exc
+        self.stdout.write(f"{response.status_code} {response.text}")
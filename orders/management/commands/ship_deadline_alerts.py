@@ -0,0 +1,55 @@
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from orders.deadlines import due_orders, due_queryset, due_windows
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Report overdue and due-today unshipped orders per account (for cron/alerting)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--list", type=int, default=10, help="Orders listed per account.")
+        parser.add_argument(
+            "--fail-on-overdue",
+            action="store_true",
+            help="Exit with an error when any account has overdue orders.",
+        )
+
+    def handle(self, *args, **options):
+        now, end_of_today, _ = due_windows()
+        # Tum hesaplar icin tek gruplu sorgu; sadece bugune kadar kargolanmasi gerekenler.
+        rows = (
+            due_queryset()
+            .filter(expected_ship_date__lt=end_of_today)
+            .values("owner_id", "owner__username")
+            .annotate(
+                overdue=Count("id", filter=Q(expected_ship_date__lt=now)),
+                due_today=Count("id", filter=Q(expected_ship_date__gte=now)),
+            )
+            .order_by("owner_id")
+        )
+
+        total_overdue = 0
+        for row in rows:
+            total_overdue += row["overdue"]
+            message = (
+                f"{row['owner__username']}: {row['overdue']} overdue, "
+                f"{row['due_today']} due today"
+            )
+            if row["overdue"]:
+                logger.warning("Ship deadline alert - %s", message)
+            self.stdout.write(message)
+            for order in due_orders(row["owner_id"], until=end_of_today, limit=options["list"]):
+                self.stdout.write(
+                    f"  #{order['etsy_order_id']} {order['buyer_name'] or '-'} "
+                    f"{timezone.localtime(order['expected_ship_date']):%Y-%m-%d %H:%M}"
+                )
+
+        if total_overdue and options["fail_on_overdue"]:
+            raise CommandError(f"{total_overdue} overdue orders.")
+        self.stdout.write(self.style.SUCCESS(f"{total_overdue} overdue orders."))
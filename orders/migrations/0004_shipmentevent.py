@@ -0,0 +1,59 @@
+# Generated by Django 6.0 on 2026-10-19 15:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0003_order_expected_ship_date"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ShipmentEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("occurred_at", models.DateTimeField()),
+                ("status", models.CharField(blank=True, max_length=100)),
+                ("event", models.CharField(blank=True, max_length=255)),
+                ("location", models.CharField(blank=True, max_length=255)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "shipment",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="events",
+                        to="orders.shipment",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("occurred_at", "id"),
+                "indexes": [
+                    models.Index(
+                        fields=["shipment", "-occurred_at"],
+                        name="orders_shev_shipment_idx",
+                    ),
+                    models.Index(
+                        fields=["status", "occurred_at"], name="orders_shev_status_idx"
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("shipment", "occurred_at", "event"),
+                        name="orders_shipmentevent_unique",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 6.0 on 2026-10-19 15:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0004_shipmentevent"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="shipment",
+            name="tracking_number",
+            field=models.CharField(blank=True, db_index=True, max_length=100),
+        ),
+        migrations.CreateModel(
+            name="TrackingUpdate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("tracking_number", models.CharField(max_length=100)),
+                ("payload", models.TextField()),
+                ("dedupe_key", models.CharField(max_length=64, unique=True)),
+                ("received_at", models.DateTimeField(auto_now_add=True)),
+                ("applied_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("applied_at__isnull", True)),
+                        fields=["received_at"],
+                        name="orders_trkupd_pending_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-19 16:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0005_trackingupdate"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="order",
+            name="version",
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 6.0 on 2026-10-19 16:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0006_order_version"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                condition=models.Q(("archived", False)),
+                fields=["owner", "-order_created_at", "-id"],
+                name="orders_order_active_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["owner", "status"], name="orders_order_owner_status_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 6.0 on 2026-10-19 16:08
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0008_rollups"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedOrder",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("etsy_order_id", models.BigIntegerField(unique=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("received", "Received"),
+                            ("shipped", "Shipped"),
+                            ("in_transit", "In transit"),
+                            ("delivered", "Delivered"),
+                            ("closed", "Closed"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("buyer_name", models.CharField(blank=True, max_length=255)),
+                ("total_amount", models.IntegerField(blank=True, null=True)),
+                ("currency", models.CharField(blank=True, max_length=10)),
+                ("order_created_at", models.DateTimeField(blank=True, null=True)),
+                ("archived_at", models.DateTimeField(blank=True, null=True)),
+                ("moved_at", models.DateTimeField(auto_now_add=True)),
+                ("payload", models.BinaryField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name="order",
+            name="archived_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="order",
+            name="closed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                condition=models.Q(("archived", False), ("status", "closed")),
+                fields=["closed_at"],
+                name="orders_order_closed_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                condition=models.Q(("archived", True)),
+                fields=["archived_at"],
+                name="orders_order_archived_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedorder",
+            name="owner",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedorder",
+            index=models.Index(
+                fields=["owner", "-order_created_at"], name="orders_archorder_owner_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 6.0 on 2026-10-19 16:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+# Mevcut siparis urunlerini etsy_listing_id uzerinden listing'lerine baglar.
+def link_order_items(apps, schema_editor):
+    Listing = apps.get_model("listings", "Listing")
+    OrderItem = apps.get_model("orders", "OrderItem")
+    OrderItem.objects.filter(etsy_listing_id__isnull=False).update(
+        listing=Subquery(
+            Listing.objects.filter(etsy_listing_id=OuterRef("etsy_listing_id")).values(
+                "id"
+            )[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("listings", "0003_listing_updated_at"),
+        ("orders", "0010_order_updated_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dailylistingrollup",
+            name="revenue",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="orderitem",
+            name="listing",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="order_items",
+                to="listings.listing",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="orderitem",
+            name="etsy_listing_id",
+            field=models.BigIntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="dailylistingrollup",
+            index=models.Index(
+                fields=["owner", "etsy_listing_id", "day"],
+                name="orders_dlr_listing_day_idx",
+            ),
+        ),
+        migrations.RunPython(link_order_items, migrations.RunPython.noop),
+    ]
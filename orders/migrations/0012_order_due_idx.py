@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-19 16:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0011_listing_sales"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                condition=models.Q(("archived", False), ("status", "received")),
+                fields=["owner", "expected_ship_date"],
+                name="orders_order_due_idx",
+            ),
+        ),
+    ]
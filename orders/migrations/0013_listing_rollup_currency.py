@@ -0,0 +1,31 @@
+# Generated by Django 6.0 on 2026-10-19 16:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0012_order_due_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="dailylistingrollup",
+            name="orders_dailylistingrollup_unique",
+        ),
+        migrations.AddField(
+            model_name="dailylistingrollup",
+            name="currency",
+            field=models.CharField(blank=True, max_length=10),
+        ),
+        migrations.AddConstraint(
+            model_name="dailylistingrollup",
+            constraint=models.UniqueConstraint(
+                fields=("owner", "day", "etsy_listing_id", "currency"),
+                name="orders_dailylistingrollup_unique",
+            ),
+        ),
+    ]
@@ -0,0 +1,154 @@
+# Generated by Django 6.0 on 2026-10-19 17:20
+
+import json
+import zlib
+
+from django.db import migrations
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+
+def _merge(totals, key, values):
+    row = totals.setdefault(key, dict.fromkeys(values, 0))
+    for field, value in values.items():
+        row[field] += value or 0
+
+
+def _parse(document, field):
+    return parse_datetime(document[field]) if document.get(field) else None
+
+
+# 0008 tablolari bos olusturdu, 0013 listing rollup'larina para birimi ekledi: mevcut veriden
+# (sicak tablolar + soguk arsiv payload'lari) bastan hesaplanir. orders.rollups.rebuild_rollups
+# ile ayni hesap; migration gecmis modellerle calistigi icin kopyasi burada.
+def rebuild_rollups(apps, schema_editor):
+    ArchivedOrder = apps.get_model("orders", "ArchivedOrder")
+    DailyListingRollup = apps.get_model("orders", "DailyListingRollup")
+    DailyOrderRollup = apps.get_model("orders", "DailyOrderRollup")
+    Order = apps.get_model("orders", "Order")
+    OrderItem = apps.get_model("orders", "OrderItem")
+    order_totals = {}
+    listing_totals = {}
+
+    order_rows = (
+        Order.objects.filter(order_created_at__isnull=False)
+        .annotate(day=TruncDate("order_created_at"))
+        .values("owner_id", "day", "currency")
+        .annotate(
+            total_orders=Count("id"),
+            total_revenue=Coalesce(Sum("total_amount"), 0),
+            total_late=Count("id", filter=Q(shipped_at__gt=F("expected_ship_date"))),
+        )
+        .order_by()
+    )
+    for row in order_rows.iterator():
+        _merge(
+            order_totals,
+            (row["owner_id"], row["day"], row["currency"]),
+            {
+                "orders": row["total_orders"],
+                "revenue": row["total_revenue"],
+                "late_shipments": row["total_late"],
+            },
+        )
+
+    unit_rows = (
+        OrderItem.objects.filter(
+            order__order_created_at__isnull=False,
+            etsy_listing_id__isnull=False,
+        )
+        .annotate(day=TruncDate("order__order_created_at"))
+        .values("order__owner_id", "day", "etsy_listing_id", "price_currency")
+        .annotate(
+            total_units=Coalesce(Sum("quantity"), 0),
+            total_revenue=Coalesce(Sum(F("quantity") * F("price_amount")), 0),
+        )
+        .order_by()
+    )
+    for row in unit_rows.iterator():
+        _merge(
+            listing_totals,
+            (
+                row["order__owner_id"],
+                row["day"],
+                row["etsy_listing_id"],
+                row["price_currency"],
+            ),
+            {"units": row["total_units"], "revenue": row["total_revenue"]},
+        )
+
+    archived = ArchivedOrder.objects.exclude(
+        etsy_order_id__in=Order.objects.values("etsy_order_id")
+    ).values_list("owner_id", "payload")
+    for owner_id, payload in archived.iterator(chunk_size=1000):
+        document = json.loads(zlib.decompress(bytes(payload)).decode("utf-8"))
+        created_at = _parse(document, "order_created_at")
+        if not created_at:
+            continue
+        day = timezone.localdate(created_at)
+        shipped_at = _parse(document, "shipped_at")
+        expected_ship_date = _parse(document, "expected_ship_date")
+        is_late = bool(
+            shipped_at and expected_ship_date and shipped_at > expected_ship_date
+        )
+        _merge(
+            order_totals,
+            (owner_id, day, document.get("currency") or ""),
+            {
+                "orders": 1,
+                "revenue": document.get("total_amount"),
+                "late_shipments": int(is_late),
+            },
+        )
+        for item in document.get("items") or []:
+            if item.get("etsy_listing_id"):
+                quantity = item.get("quantity") or 0
+                _merge(
+                    listing_totals,
+                    (
+                        owner_id,
+                        day,
+                        item["etsy_listing_id"],
+                        item.get("price_currency") or "",
+                    ),
+                    {
+                        "units": quantity,
+                        "revenue": quantity * (item.get("price_amount") or 0),
+                    },
+                )
+
+    DailyOrderRollup.objects.all().delete()
+    DailyListingRollup.objects.all().delete()
+    DailyOrderRollup.objects.bulk_create(
+        (
+            DailyOrderRollup(owner_id=owner_id, day=day, currency=currency, **values)
+            for (owner_id, day, currency), values in order_totals.items()
+        ),
+        batch_size=1000,
+    )
+    DailyListingRollup.objects.bulk_create(
+        (
+            DailyListingRollup(
+                owner_id=owner_id,
+                day=day,
+                etsy_listing_id=listing_id,
+                currency=currency,
+                **values,
+            )
+            for (owner_id, day, listing_id, currency), values in listing_totals.items()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0013_listing_rollup_currency"),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-19 17:06
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0014_rebuild_rollups"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                django.db.models.functions.text.Lower("buyer_name"),
+                name="orders_order_buyer_lower_idx",
+            ),
+        ),
+    ]
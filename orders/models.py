@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.db import models
+from django.db.models.functions import Lower
 
 
 class Order(models.Model):
@@ -22,16 +23,63 @@ class Order(models.Model):
     expected_ship_date = models.DateTimeField(null=True, blank=True)
     last_synced_at = models.DateTimeField(null=True, blank=True)
     archived = models.BooleanField(default=False)
+    closed_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(null=True, blank=True)
+    # Kart fragment cache anahtari; kartta gorunen her degisiklikte artirilir.
+    version = models.PositiveIntegerField(default=1)
+    # version ile birlikte guncellenir; API'nin updated_since filtresi bunu kullanir.
+    updated_at = models.DateTimeField(null=True, blank=True)
 
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
 
+    class Meta:
+        indexes = [
+            # order_list / order_page: aktif siparisler, en yeniden eskiye keyset.
+            models.Index(
+                fields=["owner", "-order_created_at", "-id"],
+                condition=models.Q(archived=False),
+                name="orders_order_active_idx",
+            ),
+            # close/archive ve durum bazli sorgular.
+            models.Index(fields=["owner", "status"], name="orders_order_owner_status_idx"),
+            # Saklama isi: otomatik arsivlenecek kapali ve soguk depoya tasinacak arsivli siparisler.
+            models.Index(
+                fields=["closed_at"],
+                condition=models.Q(status="closed", archived=False),
+                name="orders_order_closed_idx",
+            ),
+            models.Index(
+                fields=["archived_at"],
+                condition=models.Q(archived=True),
+                name="orders_order_archived_idx",
+            ),
+            # Kargolanacaklar kuyrugu: henuz kargolanmamis aktif siparisler, son tarihe gore.
+            models.Index(
+                fields=["owner", "expected_ship_date"],
+                condition=models.Q(status="received", archived=False),
+                name="orders_order_due_idx",
+            ),
+            # API: updated_since ile artimli cekim.
+            models.Index(fields=["owner", "updated_at"], name="orders_order_updated_idx"),
+            # Admin aramasi: alici adi on eki, buyuk/kucuk harf duyarsiz.
+            models.Index(Lower("buyer_name"), name="orders_order_buyer_lower_idx"),
+        ]
+
     def __str__(self):
         return f"{self.etsy_order_id} - {self.buyer_name}"
 
 
 class OrderItem(models.Model):
     order = models.ForeignKey(Order, related_name="items", on_delete=models.CASCADE)
-    etsy_listing_id = models.BigIntegerField(null=True, blank=True)
+    etsy_listing_id = models.BigIntegerField(null=True, blank=True, db_index=True)
+    # Sync'te etsy_listing_id uzerinden baglanir; listing henuz cekilmediyse bos kalir.
+    listing = models.ForeignKey(
+        "listings.Listing",
+        null=True,
+        blank=True,
+        related_name="order_items",
+        on_delete=models.SET_NULL,
+    )
     title = models.CharField(max_length=255, blank=True)
     quantity = models.IntegerField(null=True, blank=True)
     price_amount = models.IntegerField(null=True, blank=True)
@@ -43,7 +91,7 @@ class OrderItem(models.Model):
 
 class Shipment(models.Model):
     order = models.OneToOneField(Order, related_name="shipment", on_delete=models.CASCADE)
-    tracking_number = models.CharField(max_length=100, blank=True)
+    tracking_number = models.CharField(max_length=100, blank=True, db_index=True)
     carrier_name = models.CharField(max_length=100, blank=True)
     carrier_status = models.CharField(max_length=100, blank=True)
     carrier_status_raw = models.TextField(blank=True)
@@ -53,3 +101,119 @@ class Shipment(models.Model):
 
     def __str__(self):
         return f"{self.order_id} - {self.tracking_number}"
+
+
+class ShipmentEvent(models.Model):
+    shipment = models.ForeignKey(Shipment, related_name="events", on_delete=models.CASCADE)
+    occurred_at = models.DateTimeField()
+    status = models.CharField(max_length=100, blank=True)
+    event = models.CharField(max_length=255, blank=True)
+    location = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ("occurred_at", "id")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["shipment", "occurred_at", "event"],
+                name="orders_shipmentevent_unique",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["shipment", "-occurred_at"], name="orders_shev_shipment_idx"),
+            models.Index(fields=["status", "occurred_at"], name="orders_shev_status_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.shipment_id} - {self.occurred_at:%Y-%m-%d %H:%M} - {self.event}"
+
+
+class TrackingUpdate(models.Model):
+    tracking_number = models.CharField(max_length=100)
+    payload = models.TextField()
+    dedupe_key = models.CharField(max_length=64, unique=True)
+    received_at = models.DateTimeField(auto_now_add=True)
+    applied_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["received_at"],
+                condition=models.Q(applied_at__isnull=True),
+                name="orders_trkupd_pending_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.tracking_number} - {self.received_at}"
+
+
+class DailyOrderRollup(models.Model):
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    day = models.DateField()
+    currency = models.CharField(max_length=10, blank=True)
+    orders = models.IntegerField(default=0)
+    revenue = models.BigIntegerField(default=0)
+    late_shipments = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["owner", "day", "currency"],
+                name="orders_dailyorderrollup_unique",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.owner_id} - {self.day} - {self.currency}"
+
+
+class DailyListingRollup(models.Model):
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    day = models.DateField()
+    etsy_listing_id = models.BigIntegerField()
+    # Satilan urunun para birimi; listing'in guncel fiyat birimi farkli olabilir.
+    currency = models.CharField(max_length=10, blank=True)
+    units = models.IntegerField(default=0)
+    # Urun fiyati x adet, urunun kendi para biriminde.
+    revenue = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["owner", "day", "etsy_listing_id", "currency"],
+                name="orders_dailylistingrollup_unique",
+            ),
+        ]
+        indexes = [
+            # Listing sayfasi: listing basina aylik satis ve son satis gunu.
+            models.Index(
+                fields=["owner", "etsy_listing_id", "day"],
+                name="orders_dlr_listing_day_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.owner_id} - {self.day} - {self.etsy_listing_id} - {self.currency}"
+
+
+class ArchivedOrder(models.Model):
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    etsy_order_id = models.BigIntegerField(unique=True)
+    status = models.CharField(max_length=20, choices=Order.Status.choices)
+    buyer_name = models.CharField(max_length=255, blank=True)
+    total_amount = models.IntegerField(null=True, blank=True)
+    currency = models.CharField(max_length=10, blank=True)
+    order_created_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(null=True, blank=True)
+    moved_at = models.DateTimeField(auto_now_add=True)
+    # Siparis, urunler, kargo ve kargo olaylarinin zlib ile sikistirilmis JSON hali.
+    payload = models.BinaryField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["owner", "-order_created_at"], name="orders_archorder_owner_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.etsy_order_id} - {self.buyer_name}"
@@ -0,0 +1,151 @@
+import cProfile
+import io
+import json
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+from .services import parse_ship_status
+from .synthetic import synthetic_listings, synthetic_receipts, synthetic_ship_activity
+
+
+class ReplayEtsyClient:
+    # Kayitli (fixture) veya sentetik Etsy yanitlarini sayfa sayfa dondurur; ag cagrisi yapmaz.
+    def __init__(self, receipts=(), listings=()):
+        self.receipts = list(receipts)
+        self.listings = list(listings)
+
+    def get_user_shops(self, user_id):
+        return {"results": [{"shop_id": 1, "shop_name": "profile"}]}
+
+    def get_shop_receipts(self, shop_id, limit=50, offset=0, min_created=None):
+        return {"count": len(self.receipts), "results": self.receipts[offset : offset + limit]}
+
+    def get_active_listings(self, shop_id, limit=50, offset=0):
+        return {"count": len(self.listings), "results": self.listings[offset : offset + limit]}
+
+    def get_listing_images(self, listing_id):
+        return {"results": [{"url_170x135": f"https://example.com/{listing_id}.jpg"}]}
+
+
+def load_replay_data(fixture=None, orders=0, listings=0, seed=0):
+    # Fixture formati: {"receipts": [...], "listings": [...], "ship_activities": {takip_no: yanit}}
+    if fixture:
+        data = json.loads(Path(fixture).read_text(encoding="utf-8"))
+        return (
+            data.get("receipts") or [],
+            data.get("listings") or [],
+            data.get("ship_activities") or {},
+        )
+    return synthetic_receipts(orders, seed=seed), synthetic_listings(listings, seed=seed), {}
+
+
+def replay_ship_status(activities, seed=0):
+    def fetch(tracking_number):
+        payload = activities.get(tracking_number) or synthetic_ship_activity(tracking_number, seed)
+        if payload.get("status") != "success":
+            return None
+        return parse_ship_status(payload.get("data") or {})
+
+    return fetch
+
+
+class StackSampler(threading.Thread):
+    # Tum thread'lerin yiginini periyodik orneklenir; async view'lerin thread'leri de gorunur.
+    def __init__(self, interval):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == self.ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(
+                        f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+                    )
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def profile_call(
+    func, output_dir, name, top=40, sample_interval=0.005, trace_frames=10, allocations=True
+):
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    sampler = StackSampler(sample_interval)
+    # Python 3.12+ cProfile sys.monitoring kullanir ve tum thread'leri izler;
+    # async view'lerin event loop thread'indeki kart uretimi de rapora girer.
+    profiler = cProfile.Profile()
+    # tracemalloc sureleri belirgin sekilde uzatir; sadece zaman bakilacaksa kapatilabilir.
+    if allocations:
+        tracemalloc.start(trace_frames)
+    sampler.start()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        result = func()
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - started
+        sampler.stop()
+        snapshot, peak = None, 0
+        if allocations:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+    paths = {
+        "stats": output_dir / f"{name}.prof",
+        "hotspots": output_dir / f"{name}.hotspots.txt",
+        "allocations": output_dir / f"{name}.alloc.txt",
+        "folded": output_dir / f"{name}.folded",
+    }
+    profiler.dump_stats(paths["stats"])
+
+    report = io.StringIO()
+    stats = pstats.Stats(profiler, stream=report).strip_dirs()
+    report.write(f"{name}: {elapsed:.3f}s wall\n\n== cumulative ==\n")
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    report.write("\n== tottime ==\n")
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(top)
+    paths["hotspots"].write_text(report.getvalue(), encoding="utf-8")
+
+    if snapshot is not None:
+        snapshot = snapshot.filter_traces(
+            [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            ]
+        )
+        lines = [f"{name}: peak {peak / 1024:.1f} KiB traced\n", "== top allocations by line =="]
+        lines += [str(stat) for stat in snapshot.statistics("lineno")[:top]]
+        lines.append("\n== top allocation tracebacks ==")
+        for stat in snapshot.statistics("traceback")[:5]:
+            lines.append(f"{stat.count} blocks, {stat.size / 1024:.1f} KiB")
+            lines += [f"    {line}" for line in stat.traceback.format()]
+        paths["allocations"].write_text("\n".join(lines) + "\n", encoding="utf-8")
+    else:
+        del paths["allocations"]
+
+    # flamegraph.pl / speedscope ile acilabilen "folded stacks" formati.
+    paths["folded"].write_text(
+        "".join(f"{stack} {count}\n" for stack, count in sampler.stacks.most_common()),
+        encoding="utf-8",
+    )
+    return result, elapsed, peak, paths
@@ -0,0 +1,111 @@
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Prefetch, Q
+from django.forms.models import model_to_dict
+from django.utils import timezone
+
+from core.conditional import bump_data_version
+
+from .models import ArchivedOrder, Order, ShipmentEvent
+from .services import bump_order_versions
+
+
+def auto_archive_closed_orders(days):
+    cutoff = timezone.now() - timezone.timedelta(days=days)
+    candidates = Order.objects.filter(status=Order.Status.CLOSED, archived=False).filter(
+        Q(closed_at__lte=cutoff)
+        | Q(closed_at__isnull=True, delivered_at__lte=cutoff)
+    )
+    owner_ids = set(candidates.values_list("owner_id", flat=True).distinct())
+    archived = bump_order_versions(candidates, archived=True, archived_at=timezone.now())
+    if archived:
+        bump_data_version(owner_ids, "orders")
+    return archived
+
+
+def _order_document(order):
+    document = model_to_dict(order, exclude=["owner"])
+    document["items"] = [model_to_dict(item, exclude=["order"]) for item in order.items.all()]
+    try:
+        shipment = order.shipment
+    except Order.shipment.RelatedObjectDoesNotExist:
+        shipment = None
+    if shipment:
+        document["shipment"] = model_to_dict(shipment, exclude=["order"])
+        document["shipment"]["events"] = [
+            model_to_dict(event, exclude=["shipment"]) for event in shipment.events.all()
+        ]
+    return document
+
+
+def pack_order(order):
+    body = json.dumps(_order_document(order), cls=DjangoJSONEncoder, ensure_ascii=False)
+    return zlib.compress(body.encode("utf-8"), 6)
+
+
+def unpack_order(archived):
+    return json.loads(zlib.decompress(bytes(archived.payload)).decode("utf-8"))
+
+
+# Uzun suredir arsivde olan siparisleri sikistirilmis halde ArchivedOrder'a tasir
+# ve sicak tablolardan (Order/OrderItem/Shipment/ShipmentEvent) siler.
+def move_to_cold_storage(days, batch_size=500):
+    cutoff = timezone.now() - timezone.timedelta(days=days)
+    candidates = Order.objects.filter(archived=True).filter(
+        Q(archived_at__lte=cutoff)
+        | Q(archived_at__isnull=True, order_created_at__lte=cutoff)
+    )
+    moved = 0
+    while True:
+        batch = list(
+            candidates.order_by("id")
+            .select_related("shipment")
+            .prefetch_related(
+                "items",
+                Prefetch("shipment__events", queryset=ShipmentEvent.objects.order_by("occurred_at")),
+            )[:batch_size]
+        )
+        if not batch:
+            break
+
+        with transaction.atomic():
+            ArchivedOrder.objects.bulk_create(
+                [
+                    ArchivedOrder(
+                        owner_id=order.owner_id,
+                        etsy_order_id=order.etsy_order_id,
+                        status=order.status,
+                        buyer_name=order.buyer_name,
+                        total_amount=order.total_amount,
+                        currency=order.currency,
+                        order_created_at=order.order_created_at,
+                        archived_at=order.archived_at,
+                        payload=pack_order(order),
+                    )
+                    for order in batch
+                ],
+                ignore_conflicts=True,
+            )
+            Order.objects.filter(id__in=[order.id for order in batch]).delete()
+        bump_data_version({order.owner_id for order in batch}, "orders")
+        moved += len(batch)
+    return moved
+
+
+def find_order(user, etsy_order_id):
+    order = (
+        Order.objects.filter(owner=user, etsy_order_id=etsy_order_id)
+        .select_related("shipment")
+        .prefetch_related("items", "shipment__events")
+        .first()
+    )
+    if order:
+        return "hot", json.loads(json.dumps(_order_document(order), cls=DjangoJSONEncoder))
+
+    archived = ArchivedOrder.objects.filter(owner=user, etsy_order_id=etsy_order_id).first()
+    if archived:
+        return "cold", unpack_order(archived)
+    return None, None
@@ -0,0 +1,182 @@
+import json
+import zlib
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import ArchivedOrder, DailyListingRollup, DailyOrderRollup, Order, OrderItem
+
+ORDER_ROLLUP_FIELDS = ("orders", "revenue", "late_shipments")
+LISTING_ROLLUP_FIELDS = ("units", "revenue")
+
+
+def _contribution(values, units):
+    orders = {}
+    listing_units = {}
+    if not values or not values.get("order_created_at"):
+        return orders, listing_units
+
+    day = timezone.localdate(values["order_created_at"])
+    shipped_at = values.get("shipped_at")
+    expected_ship_date = values.get("expected_ship_date")
+    is_late = bool(shipped_at and expected_ship_date and shipped_at > expected_ship_date)
+    orders[(day, values.get("currency") or "")] = {
+        "orders": 1,
+        "revenue": values.get("total_amount") or 0,
+        "late_shipments": int(is_late),
+    }
+    for listing_id, quantity, price_amount, price_currency in units:
+        if listing_id:
+            key = (day, listing_id, price_currency or "")
+            sales = listing_units.setdefault(key, {"units": 0, "revenue": 0})
+            sales["units"] += quantity or 0
+            sales["revenue"] += (quantity or 0) * (price_amount or 0)
+    return orders, listing_units
+
+
+def _add(model, lookup, deltas):
+    deltas = {field: value for field, value in deltas.items() if value}
+    if not deltas:
+        return
+    row, created = model.objects.get_or_create(**lookup, defaults=deltas)
+    if not created:
+        model.objects.filter(pk=row.pk).update(
+            **{field: F(field) + value for field, value in deltas.items()}
+        )
+
+
+# Bir siparisin eski ve yeni halinin farkini gunluk rollup tablolarina yansitir.
+def apply_order_rollups(owner_id, before, before_units, after, after_units):
+    old_orders, old_units = _contribution(before, before_units)
+    new_orders, new_units = _contribution(after, after_units)
+
+    for day, currency in old_orders.keys() | new_orders.keys():
+        old = old_orders.get((day, currency), {})
+        new = new_orders.get((day, currency), {})
+        _add(
+            DailyOrderRollup,
+            {"owner_id": owner_id, "day": day, "currency": currency},
+            {field: new.get(field, 0) - old.get(field, 0) for field in ORDER_ROLLUP_FIELDS},
+        )
+
+    for key in old_units.keys() | new_units.keys():
+        day, listing_id, currency = key
+        old = old_units.get(key, {})
+        new = new_units.get(key, {})
+        _add(
+            DailyListingRollup,
+            {
+                "owner_id": owner_id,
+                "day": day,
+                "etsy_listing_id": listing_id,
+                "currency": currency,
+            },
+            {field: new.get(field, 0) - old.get(field, 0) for field in LISTING_ROLLUP_FIELDS},
+        )
+
+
+def _archived_contribution(payload):
+    # Soguk arsivdeki siparis, sicak tablodaki haliyle ayni katkiyi verir.
+    document = json.loads(zlib.decompress(bytes(payload)).decode("utf-8"))
+    values = {
+        "currency": document.get("currency"),
+        "total_amount": document.get("total_amount"),
+        **{
+            field: parse_datetime(document[field]) if document.get(field) else None
+            for field in ("order_created_at", "shipped_at", "expected_ship_date")
+        },
+    }
+    units = [
+        (
+            item.get("etsy_listing_id"),
+            item.get("quantity"),
+            item.get("price_amount"),
+            item.get("price_currency"),
+        )
+        for item in document.get("items") or []
+    ]
+    return _contribution(values, units)
+
+
+def _merge(totals, key, values):
+    row = totals.setdefault(key, dict.fromkeys(values, 0))
+    for field, value in values.items():
+        row[field] += value or 0
+
+
+# Rollup'lari bastan hesaplar: sicak tablolar tek gruplu taramayla, soguk arsive tasinmis
+# siparisler payload'lari cozulerek; arsivlenen gunlerin gecmisi kaybolmaz.
+def rebuild_rollups(batch_size=1000):
+    order_totals = {}
+    listing_totals = {}
+
+    order_rows = (
+        Order.objects.filter(order_created_at__isnull=False)
+        .annotate(day=TruncDate("order_created_at"))
+        .values("owner_id", "day", "currency")
+        .annotate(
+            orders=Count("id"),
+            revenue=Coalesce(Sum("total_amount"), 0),
+            late_shipments=Count("id", filter=Q(shipped_at__gt=F("expected_ship_date"))),
+        )
+        .order_by()
+    )
+    for row in order_rows.iterator():
+        key = (row["owner_id"], row["day"], row["currency"])
+        _merge(order_totals, key, {field: row[field] for field in ORDER_ROLLUP_FIELDS})
+
+    unit_rows = (
+        OrderItem.objects.filter(
+            order__order_created_at__isnull=False,
+            etsy_listing_id__isnull=False,
+        )
+        .annotate(day=TruncDate("order__order_created_at"))
+        .values("order__owner_id", "day", "etsy_listing_id", "price_currency")
+        .annotate(
+            units=Coalesce(Sum("quantity"), 0),
+            revenue=Coalesce(Sum(F("quantity") * F("price_amount")), 0),
+        )
+        .order_by()
+    )
+    for row in unit_rows.iterator():
+        key = (row["order__owner_id"], row["day"], row["etsy_listing_id"], row["price_currency"])
+        _merge(listing_totals, key, {field: row[field] for field in LISTING_ROLLUP_FIELDS})
+
+    # Sicak tabloda da olan (yeniden sync edilmis) siparis iki kez sayilmaz.
+    archived = ArchivedOrder.objects.exclude(
+        etsy_order_id__in=Order.objects.values("etsy_order_id")
+    ).values_list("owner_id", "payload")
+    for owner_id, payload in archived.iterator(chunk_size=batch_size):
+        orders, listings = _archived_contribution(payload)
+        for (day, currency), values in orders.items():
+            _merge(order_totals, (owner_id, day, currency), values)
+        for (day, listing_id, currency), values in listings.items():
+            _merge(listing_totals, (owner_id, day, listing_id, currency), values)
+
+    with transaction.atomic():
+        DailyOrderRollup.objects.all().delete()
+        DailyListingRollup.objects.all().delete()
+        DailyOrderRollup.objects.bulk_create(
+            (
+                DailyOrderRollup(owner_id=owner_id, day=day, currency=currency, **values)
+                for (owner_id, day, currency), values in order_totals.items()
+            ),
+            batch_size=batch_size,
+        )
+        DailyListingRollup.objects.bulk_create(
+            (
+                DailyListingRollup(
+                    owner_id=owner_id,
+                    day=day,
+                    etsy_listing_id=listing_id,
+                    currency=currency,
+                    **values,
+                )
+                for (owner_id, day, listing_id, currency), values in listing_totals.items()
+            ),
+            batch_size=batch_size,
+        )
+    return len(order_totals), len(listing_totals)
@@ -1,17 +1,86 @@
+import hashlib
 import json
 import logging
 from datetime import timezone as dt_timezone
 
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Q, Subquery
 from django.utils import timezone
 
+from core.conditional import bump_data_version
 from etsy.client import EtsyClient
 from etsy.models import EtsyAccount
+from etsy.progress import sync_phase
+from listings.models import Listing
 
-from .models import Order, OrderItem, Shipment
+from .models import ArchivedOrder, Order, OrderItem, Shipment, ShipmentEvent, TrackingUpdate
+from .rollups import apply_order_rollups
 from .shipentegra import ShipentegraClient
 
 logger = logging.getLogger(__name__)
 
+TRACKING_STATUSES = {Order.Status.IN_TRANSIT, Order.Status.DELIVERED}
+TRACKING_UPDATE_RETENTION_DAYS = 7
+
+# Siparis kartinda ve KPI rollup'larinda kullanilan alanlar; degistiklerinde
+# Order.version artirilir ve rollup farki uygulanir.
+CARD_FIELDS = (
+    "status",
+    "archived",
+    "buyer_name",
+    "total_amount",
+    "currency",
+    "order_created_at",
+    "shipped_at",
+    "delivered_at",
+    "expected_ship_date",
+)
+SHIPMENT_CARD_FIELDS = (
+    "tracking_number",
+    "carrier_name",
+    "carrier_status",
+    "shipped_at",
+    "delivered_at",
+)
+ITEM_FIELDS = ("etsy_listing_id", "title", "quantity", "price_amount", "price_currency")
+
+
+def _values(instance, fields):
+    return {field: getattr(instance, field) for field in fields}
+
+
+def bump_order_versions(queryset, **changes):
+    return queryset.update(version=F("version") + 1, updated_at=timezone.now(), **changes)
+
+
+# Tek UPDATE ile sadece teslim edilmis siparisleri kapatir; degisen satir sayisini dondurur.
+def close_orders(user, order_ids):
+    updated = bump_order_versions(
+        Order.objects.filter(owner=user, id__in=order_ids, status=Order.Status.DELIVERED),
+        status=Order.Status.CLOSED,
+        closed_at=timezone.now(),
+    )
+    if updated:
+        bump_data_version(user.id, "orders")
+    return updated
+
+
+def archive_orders(user, order_ids):
+    updated = bump_order_versions(
+        Order.objects.filter(
+            owner=user,
+            id__in=order_ids,
+            status=Order.Status.CLOSED,
+            archived=False,
+        ),
+        archived=True,
+        archived_at=timezone.now(),
+    )
+    if updated:
+        bump_data_version(user.id, "orders")
+    return updated
+
 
 def _ensure_shop(account, client):
     if account.shop_id:
@@ -84,6 +153,44 @@ def _parse_iso_datetime(value):
         parsed = parsed.replace(tzinfo=dt_timezone.utc)
     return parsed
 
+ACTIVITY_TIMESTAMP_KEYS = (
+    "date",
+    "eventDate",
+    "event_date",
+    "timestamp",
+    "createdAt",
+    "created_at",
+    "time",
+)
+
+
+def _activity_timestamp(activity):
+    for key in ACTIVITY_TIMESTAMP_KEYS:
+        if activity.get(key):
+            return _parse_iso_datetime(activity.get(key))
+    return None
+
+
+def _normalize_activities(activities):
+    events = []
+    for activity in activities:
+        if not isinstance(activity, dict):
+            continue
+        occurred_at = _activity_timestamp(activity)
+        if not occurred_at:
+            continue
+        events.append(
+            {
+                "occurred_at": occurred_at,
+                "status": (activity.get("status") or "")[:100],
+                "event": (activity.get("event") or "")[:255],
+                "location": (activity.get("location") or "")[:255],
+            }
+        )
+    events.sort(key=lambda event: event["occurred_at"])
+    return events
+
+
 def fetch_ship_status(tracking_number):
     client = ShipentegraClient()
     payload = client.get_shipment_activities(tracking_number)
@@ -92,32 +199,20 @@ def fetch_ship_status(tracking_number):
     if payload.get("status") != "success":
         return None
 
-    data = payload.get("data") or {}
+    return parse_ship_status(payload.get("data") or {})
+
+
+def parse_ship_status(data):
     status_text = data.get("status") or ""
     summary_text = data.get("summary") or ""
     activities = data.get("activities") or []
-    last_event = ""
-    if activities:
-        last_event = activities[-1].get("event") or ""
 
     delivered_at = _parse_iso_datetime(data.get("deliveryDate"))
 
-    last_activity_value = None
+    last_activity_at = None
     if activities:
-        last_activity = activities[-1] or {}
-        for key in (
-            "date",
-            "eventDate",
-            "event_date",
-            "timestamp",
-            "createdAt",
-            "created_at",
-            "time",
-        ):
-            if last_activity.get(key):
-                last_activity_value = last_activity.get(key)
-                break
-    last_activity_at = _parse_iso_datetime(last_activity_value) or delivered_at
+        last_activity_at = _activity_timestamp(activities[-1] or {})
+    last_activity_at = last_activity_at or delivered_at
 
     is_delivered = status_text.strip().upper() == "DELIVERED"
     last_status = (activities[0].get("status") or "") if activities else ""
@@ -133,15 +228,199 @@ def fetch_ship_status(tracking_number):
         "is_delivered": is_delivered,
         "is_in_transit": is_in_transit,
         "summary": summary_text,
-        "last_event": last_event,
+        "events": _normalize_activities(activities),
         "raw": json.dumps(data, ensure_ascii=False),
     }
 
+
+def append_shipment_events(shipment, events):
+    if not events:
+        return
+
+    last_occurred_at = (
+        shipment.events.order_by("-occurred_at")
+        .values_list("occurred_at", flat=True)
+        .first()
+    )
+    new_events = [
+        ShipmentEvent(shipment=shipment, **event)
+        for event in events
+        if last_occurred_at is None or event["occurred_at"] >= last_occurred_at
+    ]
+    if new_events:
+        # Ayni zaman damgasindaki olaylar tekrar gelebilir; unique constraint eler.
+        ShipmentEvent.objects.bulk_create(new_events, ignore_conflicts=True)
+
+
+# Son olayi `days` gunden eski, hala yolda olan kargolar; son olay (shipment, occurred_at)
+# indeksinden okunur, carrier_status_raw JSON'u parse edilmez.
+def stuck_in_transit(user, days):
+    cutoff = timezone.now() - timezone.timedelta(days=days)
+    last_event = ShipmentEvent.objects.filter(shipment=OuterRef("pk")).order_by("-occurred_at")
+    return (
+        Shipment.objects.filter(
+            order__owner=user,
+            order__status=Order.Status.IN_TRANSIT,
+            order__archived=False,
+        )
+        .annotate(
+            last_event_at=Subquery(last_event.values("occurred_at")[:1]),
+            last_event=Subquery(last_event.values("event")[:1]),
+        )
+        .filter(last_event_at__lt=cutoff)
+        .select_related("order")
+        .order_by("last_event_at")
+    )
+
+
+def _tracking_poll_due(shipment):
+    interval = settings.SHIPENTEGRA_POLL_INTERVAL_MINUTES
+    if not interval or not shipment.last_checked_at:
+        return True
+    return shipment.last_checked_at <= timezone.now() - timezone.timedelta(minutes=interval)
+
+
+def _apply_ship_status(order, shipment, ship_status, client=None):
+    shipment.carrier_status = ship_status.get("status", "")
+    shipment.carrier_status_raw = ship_status.get("raw", "")
+    shipment.delivered_at = ship_status.get("delivered_at") or ship_status.get(
+        "last_activity_at"
+    )
+    if ship_status.get("is_delivered"):
+        if shipment.delivered_at and not order.delivered_at:
+            order.delivered_at = shipment.delivered_at
+        if order.status != Order.Status.CLOSED and order.status != Order.Status.DELIVERED:
+            order.status = Order.Status.DELIVERED
+            send_etsy_message(client, order)
+    elif ship_status.get("is_in_transit"):
+        if order.status not in {Order.Status.DELIVERED, Order.Status.CLOSED}:
+            order.status = Order.Status.IN_TRANSIT
+
+
+def enqueue_tracking_updates(payloads):
+    for data in payloads:
+        if not isinstance(data, dict) or not str(data.get("trackingNumber") or "").strip():
+            raise ValueError("trackingNumber is required.")
+
+    accepted = 0
+    duplicates = 0
+    for data in payloads:
+        tracking_number = str(data["trackingNumber"]).strip()
+        body = json.dumps(data, ensure_ascii=False, sort_keys=True)
+        dedupe_key = hashlib.sha256(body.encode("utf-8")).hexdigest()
+        _, created = TrackingUpdate.objects.get_or_create(
+            dedupe_key=dedupe_key,
+            defaults={"tracking_number": tracking_number[:100], "payload": body},
+        )
+        if created:
+            accepted += 1
+        else:
+            duplicates += 1
+    return accepted, duplicates
+
+
+# Sadece shipment'i olan takip numaralari; siparis sync'i shipment'i olusturana kadar bekler.
+def pending_tracking_updates():
+    return (
+        TrackingUpdate.objects.filter(applied_at__isnull=True)
+        .filter(Exists(Shipment.objects.filter(tracking_number=OuterRef("tracking_number"))))
+        .order_by("received_at", "id")
+    )
+
+
+def apply_tracking_updates(limit=500):
+    now = timezone.now()
+    # Okuma da yazma transaction'i (IMMEDIATE) icinde: arada kapatilan/arsivlenen siparis
+    # eski haliyle ezilmez, version da ayni degeri iki farkli kart icin almaz.
+    with transaction.atomic():
+        pending = list(pending_tracking_updates()[:limit])
+        if not pending:
+            return 0
+
+        # Durum en son push'tan alinir; olaylar tum push'lardan birlestirilir.
+        latest = {}
+        events_by_tracking = {}
+        for update in pending:
+            ship_status = parse_ship_status(json.loads(update.payload))
+            latest[update.tracking_number] = ship_status
+            events_by_tracking.setdefault(update.tracking_number, []).extend(
+                ship_status.get("events") or []
+            )
+
+        shipments = Shipment.objects.filter(tracking_number__in=latest.keys()).select_related(
+            "order"
+        )
+        changed_shipments = []
+        changed_orders = []
+        for shipment in shipments:
+            order = shipment.order
+            _apply_ship_status(order, shipment, latest[shipment.tracking_number])
+            shipment.last_checked_at = now
+            order.version = F("version") + 1
+            order.updated_at = now
+            changed_shipments.append(shipment)
+            changed_orders.append(order)
+        matched = {shipment.tracking_number for shipment in changed_shipments}
+
+        for shipment in changed_shipments:
+            events = sorted(
+                events_by_tracking[shipment.tracking_number], key=lambda event: event["occurred_at"]
+            )
+            append_shipment_events(shipment, events)
+        Shipment.objects.bulk_update(
+            changed_shipments,
+            ["carrier_status", "carrier_status_raw", "delivered_at", "last_checked_at"],
+        )
+        Order.objects.bulk_update(
+            changed_orders, ["status", "delivered_at", "version", "updated_at"]
+        )
+        TrackingUpdate.objects.filter(
+            id__in=[update.id for update in pending if update.tracking_number in matched]
+        ).update(applied_at=now)
+
+    # Uygulananlar ve shipment'i hic olusmayan eski push'lar saklama suresi sonunda silinir.
+    cutoff = now - timezone.timedelta(days=TRACKING_UPDATE_RETENTION_DAYS)
+    TrackingUpdate.objects.filter(
+        Q(applied_at__lt=cutoff) | Q(applied_at__isnull=True, received_at__lt=cutoff)
+    ).delete()
+    if changed_orders:
+        bump_data_version({order.owner_id for order in changed_orders}, "orders")
+    logger.info("Applied %s tracking updates to %s shipments", len(pending), len(changed_shipments))
+    return len(changed_shipments)
+
+
 def send_etsy_message(_client, _order):
     # TODO: Etsy Messaging API ile teslim mesaji gonder.
     return False
 
-def sync_orders(user):
+def _prefetch_ship_statuses(receipts, progress=None):
+    # Kargo sorgulari yazma transaction'i acilmadan once yapilir; kilit kisa tutulur.
+    tracking_numbers = {}
+    for receipt in receipts:
+        tracking_number, _ = _extract_tracking(receipt)
+        if tracking_number:
+            tracking_numbers[receipt.get("receipt_id")] = tracking_number
+
+    shipments = {
+        shipment.order.etsy_order_id: shipment
+        for shipment in Shipment.objects.filter(
+            order__etsy_order_id__in=tracking_numbers.keys()
+        ).select_related("order")
+    }
+    ship_statuses = {}
+    for etsy_order_id, tracking_number in tracking_numbers.items():
+        shipment = shipments.get(etsy_order_id) or Shipment()
+        if tracking_number in ship_statuses or not _tracking_poll_due(shipment):
+            continue
+        ship_statuses[tracking_number] = (timezone.now(), fetch_ship_status(tracking_number))
+        if ship_statuses[tracking_number][1] is None:
+            logger.info("No Shipentegra status for tracking number %s", tracking_number)
+        if progress:
+            progress.add("tracking_lookups")
+    return ship_statuses
+
+
+def sync_orders(user, progress=None):
     account = EtsyAccount.objects.get(user=user)
     client = EtsyClient(account.access_token)
 
@@ -152,6 +431,8 @@ def sync_orders(user):
     min_created = int((timezone.now() - timezone.timedelta(days=30)).timestamp())
     total = 0
 
+    apply_tracking_updates()
+
     while True:
         payload = client.get_shop_receipts(
             shop_id=account.shop_id,
@@ -162,110 +443,176 @@ def sync_orders(user):
         receipts = payload.get("results", [])
         if not receipts:
             break
+        if progress:
+            progress.add("pages")
+
+        # Soguk depoya tasinmis siparisler sicak tablolara geri yazilmaz.
+        cold_order_ids = set(
+            ArchivedOrder.objects.filter(
+                etsy_order_id__in=[receipt.get("receipt_id") for receipt in receipts]
+            ).values_list("etsy_order_id", flat=True)
+        )
 
-        for receipt in receipts:
-            etsy_order_id = receipt.get("receipt_id")
-            if not etsy_order_id:
-                continue
-            existing = (
-                Order.objects.filter(etsy_order_id=etsy_order_id)
-                .values("status", "archived")
-                .first()
-            )
-            existing_status = existing.get("status") if existing else None
-            existing_archived = existing.get("archived") if existing else False
-
-            buyer_name = receipt.get("name") or ""
-            buyer_email = receipt.get("buyer_email") or ""
-            total_amount, currency = _extract_price(receipt)
-            is_shipped = receipt.get("is_shipped")
-
-            items = receipt.get("transactions") or []
-            expected_ship_date = None
-            expected_candidates = []
-            for item in items:
-                expected_value = item.get("expected_ship_date")
-                if expected_value is None:
-                    expected_value = item.get("expected_ship_date_timestamp")
-                parsed = _parse_ts(expected_value)
-                if parsed:
-                    expected_candidates.append(parsed)
-            if expected_candidates:
-                expected_ship_date = min(expected_candidates)
-
-            status = Order.Status.RECEIVED
-            shipped_at = None
-            if is_shipped:
-                status = Order.Status.SHIPPED
-                shipments = receipt.get("shipments") or []
-                shipped_at = _parse_ts(shipments[0].get("shipment_notification_timestamp"))
-
-            order_created_at = _parse_ts(receipt.get("created_timestamp"))
-
-            order, _ = Order.objects.update_or_create(
-                etsy_order_id=etsy_order_id,
-                defaults={
-                    "owner": user,
-                    "status": status,
-                    "buyer_name": buyer_name,
-                    "buyer_email": buyer_email,
-                    "total_amount": total_amount,
-                    "currency": currency,
-                    "order_created_at": order_created_at,
-                    "shipped_at": shipped_at,
-                    "expected_ship_date": expected_ship_date,
-                    "last_synced_at": timezone.now(),
-                },
-            )
-            if existing_status == Order.Status.CLOSED and order.status != Order.Status.CLOSED:
-                order.status = Order.Status.CLOSED
-                order.save(update_fields=["status"])
-            if existing_archived and not order.archived:
-                order.archived = True
-                order.save(update_fields=["archived"])
-
-            if items:
-                order.items.all().delete()
-                for item in items:
-                    OrderItem.objects.create(
-                        order=order,
-                        etsy_listing_id=item.get("listing_id"),
-                        title=item.get("title", ""),
-                        quantity=item.get("quantity"),
-                        price_amount=(item.get("price") or {}).get("amount"),
-                        price_currency=(item.get("price") or {}).get("currency_code", ""),
-                    )
-
-            tracking_number, carrier_name = _extract_tracking(receipt)
-            if tracking_number:
-                shipment, _ = Shipment.objects.get_or_create(order=order)
-                shipment.tracking_number = tracking_number
-                shipment.carrier_name = carrier_name
-                shipment.shipped_at = shipped_at
-                shipment.last_checked_at = timezone.now()
-
-                ship_status = fetch_ship_status(tracking_number)
-                if ship_status:
-                    shipment.carrier_status = ship_status.get("status", "")
-                    shipment.carrier_status_raw = ship_status.get("raw", "")
-                    shipment.delivered_at = ship_status.get("delivered_at") or ship_status.get(
-                        "last_activity_at"
-                    )
-                    if ship_status.get("is_delivered"):
-                        if shipment.delivered_at and not order.delivered_at:
-                            order.delivered_at = shipment.delivered_at
-                        if order.status != Order.Status.CLOSED and order.status != Order.Status.DELIVERED:
-                            order.status = Order.Status.DELIVERED
-                            send_etsy_message(client, order)
-                    elif ship_status.get("is_in_transit"):
-                        if order.status not in {Order.Status.DELIVERED, Order.Status.CLOSED}:
-                            order.status = Order.Status.IN_TRANSIT
-
-                shipment.save()
-                order.save(update_fields=["status", "delivered_at"])
-
-            total += 1
+        ship_statuses = _prefetch_ship_statuses(
+            [receipt for receipt in receipts if receipt.get("receipt_id") not in cold_order_ids],
+            progress,
+        )
+
+        with sync_phase(progress, "database"), transaction.atomic():
+            total += _write_receipts(user, receipts, cold_order_ids, ship_statuses, client, progress)
+            # Her commit edilen sayfa surumu artirir; sync sonradan hata alsa da 304'ler bayatlamaz.
+            transaction.on_commit(lambda: bump_data_version(user.id, "orders"))
 
         offset += limit
 
+    logger.info(
+        "Order sync finished for user %s: %s orders in %s pages", user.id, total, offset // limit
+    )
     return total
+
+
+def _write_receipts(user, receipts, cold_order_ids, ship_statuses, client, progress=None):
+    written = 0
+    # Sayfadaki urunlerin listing'leri tek sorguda; OrderItem.listing bununla baglanir.
+    listing_ids = dict(
+        Listing.objects.filter(
+            owner=user,
+            etsy_listing_id__in={
+                item.get("listing_id")
+                for receipt in receipts
+                for item in receipt.get("transactions") or []
+                if item.get("listing_id")
+            },
+        ).values_list("etsy_listing_id", "id")
+    )
+    for receipt in receipts:
+        etsy_order_id = receipt.get("receipt_id")
+        if not etsy_order_id or etsy_order_id in cold_order_ids:
+            continue
+        existing = (
+            Order.objects.filter(etsy_order_id=etsy_order_id)
+            .values(*CARD_FIELDS)
+            .first()
+        )
+        existing_status = existing.get("status") if existing else None
+        existing_archived = existing.get("archived") if existing else False
+
+        buyer_name = receipt.get("name") or ""
+        buyer_email = receipt.get("buyer_email") or ""
+        total_amount, currency = _extract_price(receipt)
+        is_shipped = receipt.get("is_shipped")
+
+        items = receipt.get("transactions") or []
+        expected_ship_date = None
+        expected_candidates = []
+        for item in items:
+            expected_value = item.get("expected_ship_date")
+            if expected_value is None:
+                expected_value = item.get("expected_ship_date_timestamp")
+            parsed = _parse_ts(expected_value)
+            if parsed:
+                expected_candidates.append(parsed)
+        if expected_candidates:
+            expected_ship_date = min(expected_candidates)
+
+        status = Order.Status.RECEIVED
+        shipped_at = None
+        if is_shipped:
+            status = Order.Status.SHIPPED
+            shipments = receipt.get("shipments") or []
+            shipped_at = _parse_ts(shipments[0].get("shipment_notification_timestamp"))
+            # Kargo takibinden gelen durum (webhook veya onceki poll) geri alinmaz.
+            if existing_status in TRACKING_STATUSES:
+                status = existing_status
+
+        order_created_at = _parse_ts(receipt.get("created_timestamp"))
+
+        order, _ = Order.objects.update_or_create(
+            etsy_order_id=etsy_order_id,
+            defaults={
+                "owner": user,
+                "status": status,
+                "buyer_name": buyer_name,
+                "buyer_email": buyer_email,
+                "total_amount": total_amount,
+                "currency": currency,
+                "order_created_at": order_created_at,
+                "shipped_at": shipped_at,
+                "expected_ship_date": expected_ship_date,
+                "last_synced_at": timezone.now(),
+            },
+        )
+        if existing_status == Order.Status.CLOSED and order.status != Order.Status.CLOSED:
+            order.status = Order.Status.CLOSED
+            order.save(update_fields=["status"])
+        if existing_archived and not order.archived:
+            order.archived = True
+            order.save(update_fields=["archived"])
+
+        changed = existing is None
+        before_units = []
+        after_units = []
+
+        if items:
+            item_rows = [
+                (
+                    item.get("listing_id"),
+                    item.get("title", ""),
+                    item.get("quantity"),
+                    (item.get("price") or {}).get("amount"),
+                    (item.get("price") or {}).get("currency_code", ""),
+                )
+                for item in items
+            ]
+            existing_rows = []
+            if existing:
+                existing_rows = list(order.items.order_by("id").values_list(*ITEM_FIELDS))
+            before_units = [(row[0], row[2], row[3], row[4]) for row in existing_rows]
+            after_units = [(row[0], row[2], row[3], row[4]) for row in item_rows]
+            if item_rows != existing_rows:
+                order.items.all().delete()
+                OrderItem.objects.bulk_create(
+                    [
+                        OrderItem(
+                            order=order,
+                            listing_id=listing_ids.get(row[0]),
+                            **dict(zip(ITEM_FIELDS, row)),
+                        )
+                        for row in item_rows
+                    ]
+                )
+                changed = True
+
+        tracking_number, carrier_name = _extract_tracking(receipt)
+        if tracking_number:
+            shipment, created = Shipment.objects.get_or_create(order=order)
+            shipment_before = _values(shipment, SHIPMENT_CARD_FIELDS)
+            shipment.tracking_number = tracking_number
+            shipment.carrier_name = carrier_name
+            shipment.shipped_at = shipped_at
+
+            ship_status = None
+            if tracking_number in ship_statuses:
+                shipment.last_checked_at, ship_status = ship_statuses[tracking_number]
+            if ship_status:
+                _apply_ship_status(order, shipment, ship_status, client)
+
+            shipment.save()
+            if ship_status:
+                append_shipment_events(shipment, ship_status.get("events"))
+            order.save(update_fields=["status", "delivered_at"])
+            if created or _values(shipment, SHIPMENT_CARD_FIELDS) != shipment_before:
+                changed = True
+
+        after = _values(order, CARD_FIELDS)
+        outcome = "unchanged"
+        if changed or after != existing:
+            bump_order_versions(Order.objects.filter(pk=order.pk))
+            apply_order_rollups(user.id, existing, before_units, after, after_units)
+            outcome = "inserted" if existing is None else "updated"
+
+        written += 1
+        if progress:
+            progress.add("records")
+            progress.add(outcome)
+    return written
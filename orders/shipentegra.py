@@ -1,10 +1,16 @@
+import hashlib
+import hmac
+
 import httpx
 from django.conf import settings
 from django.core.cache import cache
 
+from core.metrics import timed_request
+
 TOKEN_CACHE_KEY = "shipentegra:access_token"
 TOKEN_TTL_BUFFER_SECONDS = 60
 TOKEN_TTL_FALLBACK_SECONDS = 30 * 60
+WEBHOOK_SIGNATURE_HEADER = "X-Shipentegra-Signature"
 
 
 def _parse_token_validity(value):
@@ -28,6 +34,17 @@ def _parse_token_validity(value):
     return TOKEN_TTL_FALLBACK_SECONDS
 
 
+def sign_webhook_body(body):
+    secret = settings.SHIPENTEGRA_WEBHOOK_SECRET.encode("utf-8")
+    return hmac.new(secret, body, hashlib.sha256).hexdigest()
+
+
+def verify_webhook_signature(body, signature):
+    if not settings.SHIPENTEGRA_WEBHOOK_SECRET or not signature:
+        return False
+    return hmac.compare_digest(sign_webhook_body(body), signature.strip())
+
+
 class ShipentegraClient:
     def __init__(self):
         self.base_url = settings.SHIPENTEGRA_BASE_URL
@@ -48,7 +65,7 @@ class ShipentegraClient:
             "clientSecret": self.client_secret,
         }
         with httpx.Client(timeout=20) as client:
-            response = client.post(url, json=payload)
+            response = timed_request(client, "shipentegra", "/auth/token", "POST", url, json=payload)
             response.raise_for_status()
             data = response.json()
 
@@ -73,6 +90,14 @@ class ShipentegraClient:
         headers = {"Authorization": f"Bearer {token}"}
         params = {"trackingNumber": tracking_number}
         with httpx.Client(timeout=20) as client:
-            response = client.get(url, headers=headers, params=params)
+            response = timed_request(
+                client,
+                "shipentegra",
+                "/logistics/shipments/activities",
+                "GET",
+                url,
+                headers=headers,
+                params=params,
+            )
             response.raise_for_status()
             return response.json()
@@ -0,0 +1,159 @@
+import random
+
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import Order, OrderItem, Shipment
+
+SYNTHETIC_STATUSES = [
+    Order.Status.RECEIVED,
+    Order.Status.SHIPPED,
+    Order.Status.IN_TRANSIT,
+    Order.Status.DELIVERED,
+    Order.Status.CLOSED,
+]
+
+
+# Olcum ve profil komutlari icin sahte siparis, urun ve kargo kayitlari uretir.
+def create_synthetic_orders(user, count, days=30, archived_ratio=0.2, batch_size=1000, seed=0):
+    rng = random.Random(seed)
+    now = timezone.now()
+    next_etsy_id = (Order.objects.aggregate(value=Max("etsy_order_id"))["value"] or 0) + 1
+    created = 0
+
+    while created < count:
+        size = min(batch_size, count - created)
+        orders = []
+        for offset in range(size):
+            status = rng.choice(SYNTHETIC_STATUSES)
+            created_at = now - timezone.timedelta(seconds=rng.randint(0, days * 86400))
+            shipped_at = None
+            delivered_at = None
+            if status != Order.Status.RECEIVED:
+                shipped_at = created_at + timezone.timedelta(days=rng.randint(1, 3))
+            if status in {Order.Status.DELIVERED, Order.Status.CLOSED}:
+                delivered_at = shipped_at + timezone.timedelta(days=rng.randint(2, 10))
+            orders.append(
+                Order(
+                    owner=user,
+                    etsy_order_id=next_etsy_id + created + offset,
+                    status=status,
+                    buyer_name=f"Buyer {rng.randint(1, 99999)}",
+                    buyer_email="buyer@example.com",
+                    total_amount=rng.randint(500, 20000),
+                    currency=rng.choice(["USD", "EUR"]),
+                    order_created_at=created_at,
+                    shipped_at=shipped_at,
+                    delivered_at=delivered_at,
+                    expected_ship_date=created_at + timezone.timedelta(days=3),
+                    last_synced_at=now,
+                    archived=status == Order.Status.CLOSED and rng.random() < archived_ratio,
+                )
+            )
+        orders = Order.objects.bulk_create(orders)
+
+        items = []
+        shipments = []
+        for order in orders:
+            for _ in range(rng.randint(1, 3)):
+                items.append(
+                    OrderItem(
+                        order=order,
+                        etsy_listing_id=rng.randint(1, 500),
+                        title=f"Listing {rng.randint(1, 500)}",
+                        quantity=rng.randint(1, 4),
+                        price_amount=rng.randint(500, 5000),
+                        price_currency=order.currency,
+                    )
+                )
+            if order.status != Order.Status.RECEIVED:
+                shipments.append(
+                    Shipment(
+                        order=order,
+                        tracking_number=f"SYN{order.etsy_order_id}",
+                        carrier_name="Synthetic",
+                        carrier_status=order.get_status_display().upper(),
+                        shipped_at=order.shipped_at,
+                        delivered_at=order.delivered_at,
+                        last_checked_at=now,
+                    )
+                )
+        OrderItem.objects.bulk_create(items)
+        Shipment.objects.bulk_create(shipments)
+        created += size
+
+    return created
+
+
+# Sync profili icin Etsy receipt, listing ve Shipentegra aktivite yanitlarinin sahte kopyalari.
+def synthetic_receipts(count, days=30, seed=0, start_id=900_000_000):
+    rng = random.Random(seed)
+    now = int(timezone.now().timestamp())
+    receipts = []
+    for index in range(count):
+        created = now - rng.randint(0, days * 86400)
+        is_shipped = rng.random() < 0.7
+        receipt = {
+            "receipt_id": start_id + index,
+            "name": f"Buyer {rng.randint(1, 99999)}",
+            "buyer_email": "buyer@example.com",
+            "created_timestamp": created,
+            "is_shipped": is_shipped,
+            "grandtotal": {"amount": rng.randint(500, 20000), "currency_code": "USD"},
+            "transactions": [
+                {
+                    "listing_id": rng.randint(1, 500),
+                    "title": f"Listing {rng.randint(1, 500)}",
+                    "quantity": rng.randint(1, 4),
+                    "price": {"amount": rng.randint(500, 5000), "currency_code": "USD"},
+                    "expected_ship_date": created + 3 * 86400,
+                }
+                for _ in range(rng.randint(1, 3))
+            ],
+            "shipments": [],
+        }
+        if is_shipped:
+            receipt["shipments"] = [
+                {
+                    "shipment_notification_timestamp": created + 86400,
+                    "tracking_code": f"SYN{start_id + index}",
+                    "carrier_name": "Synthetic",
+                }
+            ]
+        receipts.append(receipt)
+    return receipts
+
+
+def synthetic_listings(count, seed=0, start_id=900_000_000):
+    rng = random.Random(seed)
+    return [
+        {
+            "listing_id": start_id + index,
+            "title": f"Listing {index}",
+            "state": "active",
+            "url": f"https://www.etsy.com/listing/{start_id + index}",
+            "quantity": rng.randint(0, 50),
+            "price": {"amount": rng.randint(500, 5000), "currency_code": "USD"},
+        }
+        for index in range(count)
+    ]
+
+
+def synthetic_ship_activity(tracking_number, seed=0):
+    rng = random.Random(f"{seed}:{tracking_number}")
+    started = timezone.now() - timezone.timedelta(days=rng.randint(1, 10))
+    steps = rng.randint(1, 8)
+    delivered = rng.random() < 0.4
+    activities = [
+        {
+            "date": (started + timezone.timedelta(hours=6 * step)).isoformat(),
+            "status": "IN TRANSIT",
+            "event": f"Scan {step}",
+            "location": "Istanbul",
+        }
+        for step in range(steps)
+    ]
+    data = {"status": "DELIVERED" if delivered else "IN TRANSIT", "activities": activities}
+    if delivered:
+        data["deliveryDate"] = activities[-1]["date"]
+    return {"status": "success", "data": data}
@@ -1,10 +1,20 @@
 from django.urls import path
 
-from . import views
+from . import api, views
 
 urlpatterns = [
     path("", views.order_list, name="orders_home"),
+    path("page/", views.order_page, name="orders_page"),
+    path("due/", views.due_to_ship, name="orders_due"),
     path("sync/", views.sync_now, name="orders_sync"),
     path("close/<int:order_id>/", views.close_order, name="orders_close"),
     path("archive/<int:order_id>/", views.archive_order, name="orders_archive"),
+    path("export/", views.order_export, name="orders_export"),
+    path("lookup/", views.order_lookup, name="orders_lookup"),
+    path("api/", api.order_api, name="orders_api"),
+    path("api/items/", api.order_item_api, name="orders_api_items"),
+    path("api/shipments/", api.shipment_api, name="orders_api_shipments"),
+    path("bulk/close/", views.bulk_close_orders, name="orders_bulk_close"),
+    path("bulk/archive/", views.bulk_archive_orders, name="orders_bulk_archive"),
+    path("webhooks/shipentegra/", views.shipentegra_webhook, name="orders_shipentegra_webhook"),
 ]
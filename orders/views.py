@@ -1,13 +1,41 @@
+import json
+from datetime import timezone as dt_timezone
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
+from django.db.models import F, Q, Sum
+from django.http import HttpResponseBadRequest, HttpResponseForbidden, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.template.loader import render_to_string
 from django.urls import reverse
 from django.utils.formats import date_format
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.gzip import gzip_page
 from django.views.decorators.http import require_POST
 from django.utils import timezone
 
-from .models import Order
-from .services import sync_orders
+from core.api import API_MAX_INT
+from core.conditional import bump_data_version, conditional_page
+from core.exports import EXPORT_CONTENT_TYPES, aexport_chunks, streaming_export_response
+from etsy.leases import SyncAlreadyRunning, acquire_sync_lease, already_running_response
+from etsy.progress import SyncProgress
+from listings.models import Listing
+
+from .deadlines import due_bucket, due_counts, due_orders, due_windows
+from .models import DailyListingRollup, DailyOrderRollup, Order
+from .exports import ORDER_EXPORT_FIELDS, order_export_rows
+from .retention import find_order
+from .services import (
+    archive_orders,
+    close_orders,
+    enqueue_tracking_updates,
+    stuck_in_transit,
+    sync_orders,
+)
+from .shipentegra import WEBHOOK_SIGNATURE_HEADER, verify_webhook_signature
 
 STATUS_STEPS = [
     {"status": Order.Status.RECEIVED, "label": "Siparis alindi", "icon": "check-lg"},
@@ -17,8 +45,17 @@ STATUS_STEPS = [
     {"status": Order.Status.CLOSED, "label": "Kapatildi", "icon": "x-circle"},
 ]
 
+# Kart sablonu degistiginde artirilir, eski fragment'lar kendiliginden gecersiz olur.
+CARD_CACHE_REVISION = 2
+BULK_ACTION_LIMIT = 500
+EXPORT_QUERY_CHUNK_SIZE = 2000
+
 STATUS_LABELS = {step["status"]: step["label"] for step in STATUS_STEPS}
 
+DASHBOARD_DAYS = 30
+DUE_LIST_LIMIT = 200
+STUCK_IN_TRANSIT_DAYS = 7
+
 STEP_STATE_LABELS = {
     "is-complete": "Tamamlandi",
     "is-active": "Islemde",
@@ -188,62 +225,173 @@ def _build_stepper(order, shipment):
     return steps, progress, active_step
 
 
-@login_required
-def order_list(request):
-    recent_cutoff = timezone.now() - timezone.timedelta(days=30)
-    orders = (
-        Order.objects.filter(
-            owner=request.user,
-            order_created_at__gte=recent_cutoff,
-            archived=False,
+def _build_card(order):
+    items_count = len(order.items.all())
+    try:
+        shipment = order.shipment
+    except Order.shipment.RelatedObjectDoesNotExist:
+        shipment = None
+    steps, progress, active_step = _build_stepper(order, shipment)
+
+    if active_step:
+        active_step["show_close_button"] = (
+            order.status == Order.Status.DELIVERED
         )
-        .select_related("shipment")
-        .prefetch_related("items")
-        .order_by("-order_created_at", "-id")
-    )
-    cards = []
-    for order in orders:
-        items_count = len(order.items.all())
-        try:
-            shipment = order.shipment
-        except Order.shipment.RelatedObjectDoesNotExist:
-            shipment = None
-        steps, progress, active_step = _build_stepper(order, shipment)
-
-        if active_step:
-            active_step["show_close_button"] = (
-                order.status == Order.Status.DELIVERED
-            )
-            active_step["show_archive_button"] = (
-                order.status == Order.Status.CLOSED
-            )
-            active_step["close_url"] = reverse("orders_close", args=[order.id])
-            active_step["archive_url"] = reverse("orders_archive", args=[order.id])
+        active_step["show_archive_button"] = (
+            order.status == Order.Status.CLOSED
+        )
+        active_step["close_url"] = reverse("orders_close", args=[order.id])
+        active_step["archive_url"] = reverse("orders_archive", args=[order.id])
+
+    return {
+        "order": order,
+        "steps": steps,
+        "progress": progress,
+        "active_step": active_step,
+        "items_count": items_count,
+        "status_label": STATUS_LABELS.get(order.status, "Bilinmiyor"),
+        "tracking_number": shipment.tracking_number if shipment else "",
+        "carrier_name": shipment.carrier_name if shipment else "",
+        "carrier_status": shipment.carrier_status if shipment else "",
+    }
 
-        cards.append(
-            {
-                "order": order,
-                "steps": steps,
-                "progress": progress,
-                "active_step": active_step,
-                "items_count": items_count,
-                "status_label": STATUS_LABELS.get(order.status, "Bilinmiyor"),
-                "tracking_number": shipment.tracking_number if shipment else "",
-                "carrier_name": shipment.carrier_name if shipment else "",
-                "carrier_status": shipment.carrier_status if shipment else "",
-            }
+
+def _card_cache_key(order_id, version):
+    return f"orders:card:{CARD_CACHE_REVISION}:{order_id}:{version}"
+
+
+async def _render_cards(order_versions):
+    keys = [_card_cache_key(order_id, version) for order_id, version in order_versions]
+    fragments = await cache.aget_many(keys)
+
+    missing = {
+        order_id: key
+        for (order_id, _), key in zip(order_versions, keys)
+        if key not in fragments
+    }
+    if missing:
+        orders = (
+            Order.objects.filter(id__in=list(missing))
+            .select_related("shipment")
+            .prefetch_related("items")
         )
-    return render(request, "orders/home.html", {"order_cards": cards})
+        fresh = {}
+        async for order in orders:
+            card = _build_card(order)
+            html = render_to_string("orders/_card.html", {"card": card})
+            fresh[_card_cache_key(order.id, order.version)] = html
+            # Arada surumu degismis olsa da kart istenen sirada, yeni haliyle gosterilir.
+            fragments[missing[order.id]] = html
+        await cache.aset_many(fresh, settings.ORDER_CARD_CACHE_TIMEOUT)
+
+    return [fragments[key] for key in keys if key in fragments]
+
+
+def _encode_cursor(order_created_at, order_id):
+    return f"{int(order_created_at.timestamp() * 1_000_000)}_{order_id}"
+
+
+def _decode_cursor(cursor):
+    try:
+        micros, order_id = cursor.split("_", 1)
+        created_at = timezone.datetime.fromtimestamp(
+            int(micros) / 1_000_000, tz=dt_timezone.utc
+        )
+        return created_at, int(order_id)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def _order_page_queryset(user, cursor=None):
+    recent_cutoff = timezone.now() - timezone.timedelta(days=30)
+    orders = Order.objects.filter(
+        owner=user,
+        order_created_at__gte=recent_cutoff,
+        archived=False,
+    )
+    position = _decode_cursor(cursor) if cursor else None
+    if position:
+        created_at, order_id = position
+        orders = orders.filter(
+            Q(order_created_at__lt=created_at)
+            | Q(order_created_at=created_at, id__lt=order_id)
+        )
+    return orders.order_by("-order_created_at", "-id").values_list(
+        "id", "version", "order_created_at"
+    )[: settings.ORDER_PAGE_SIZE + 1]
+
+
+def _paginate(rows):
+    next_cursor = None
+    if len(rows) > settings.ORDER_PAGE_SIZE:
+        rows = rows[: settings.ORDER_PAGE_SIZE]
+        _, _, last_created_at = rows[-1]
+        next_cursor = _encode_cursor(last_created_at, rows[-1][0])
+    return [(order_id, version) for order_id, version, _ in rows], next_cursor
+
+
+def _order_page(user, cursor=None):
+    return _paginate(list(_order_page_queryset(user, cursor)))
+
+
+async def _aorder_page(user, cursor=None):
+    return _paginate([row async for row in _order_page_queryset(user, cursor)])
+
+
+@login_required
+@gzip_page
+@conditional_page("orders")
+async def order_list(request):
+    user = await request.auser()
+    order_versions, next_cursor = await _aorder_page(user)
+    context = {
+        "order_cards": await _render_cards(order_versions),
+        "next_cursor": next_cursor,
+    }
+    # Context processor'lar (user, messages) session'a senkron erisir.
+    return await sync_to_async(render)(request, "orders/home.html", context)
+
+
+@login_required
+@gzip_page
+@conditional_page("orders")
+async def order_page(request):
+    cursor = request.GET.get("cursor")
+    if not cursor or not _decode_cursor(cursor):
+        return HttpResponseBadRequest("Invalid cursor")
+
+    user = await request.auser()
+    order_versions, next_cursor = await _aorder_page(user, cursor)
+    return JsonResponse(
+        {
+            "html": "".join(await _render_cards(order_versions)),
+            "count": len(order_versions),
+            "next_cursor": next_cursor,
+        }
+    )
 
 
 @login_required
 @require_POST
 def sync_now(request):
+    run_id = request.POST.get("run", "")
+    try:
+        lease = acquire_sync_lease(request.user.id, "orders", run_id)
+    except SyncAlreadyRunning as running:
+        return already_running_response(
+            request, running, "Siparis senkronu zaten calisiyor.", "orders_home"
+        )
+
+    progress = SyncProgress(request.user.id, "orders", run_id, lease=lease)
     try:
-        total = sync_orders(request.user)
+        total = sync_orders(request.user, progress=progress)
+        progress.finish()
         messages.success(request, f"{total} siparis senkronize edildi.")
     except Exception as exc:
+        progress.finish("error", str(exc))
         messages.error(request, f"Siparis senkronu basarisiz: {exc}")
+    finally:
+        lease.release()
     return redirect("orders_home")
 
 
@@ -256,7 +404,11 @@ def close_order(request, order_id):
         return redirect("orders_home")
 
     order.status = Order.Status.CLOSED
-    order.save(update_fields=["status"])
+    order.closed_at = timezone.now()
+    order.version = F("version") + 1
+    order.updated_at = order.closed_at
+    order.save(update_fields=["status", "closed_at", "version", "updated_at"])
+    bump_data_version(request.user.id, "orders")
     messages.success(request, "Siparis kapatildi olarak isaretlendi.")
     return redirect("orders_home")
 
@@ -273,6 +425,179 @@ def archive_order(request, order_id):
         return redirect("orders_home")
 
     order.archived = True
-    order.save(update_fields=["archived"])
+    order.archived_at = timezone.now()
+    order.version = F("version") + 1
+    order.updated_at = order.archived_at
+    order.save(update_fields=["archived", "archived_at", "version", "updated_at"])
+    bump_data_version(request.user.id, "orders")
     messages.success(request, "Siparis arsive alindi.")
     return redirect("orders_home")
+
+
+def _selected_order_ids(request):
+    order_ids = set()
+    for value in request.POST.getlist("order_ids"):
+        # isdigit() "²" gibi karakterleri de kabul eder; int() ve SQLite INTEGER araligi.
+        try:
+            order_id = int(value)
+        except ValueError:
+            continue
+        if 0 < order_id <= API_MAX_INT:
+            order_ids.add(order_id)
+    return list(order_ids)[:BULK_ACTION_LIMIT]
+
+
+@login_required
+@require_POST
+def bulk_close_orders(request):
+    order_ids = _selected_order_ids(request)
+    if not order_ids:
+        messages.error(request, "Kapatmak icin siparis secilmedi.")
+        return redirect("orders_home")
+
+    updated = close_orders(request.user, order_ids)
+    skipped = len(order_ids) - updated
+    messages.success(request, f"{updated} siparis kapatildi.")
+    if skipped:
+        messages.warning(request, f"{skipped} siparis teslim edilmedigi icin kapatilmadi.")
+    return redirect("orders_home")
+
+
+@login_required
+@require_POST
+def bulk_archive_orders(request):
+    order_ids = _selected_order_ids(request)
+    if not order_ids:
+        messages.error(request, "Arsivlemek icin siparis secilmedi.")
+        return redirect("orders_home")
+
+    updated = archive_orders(request.user, order_ids)
+    skipped = len(order_ids) - updated
+    messages.success(request, f"{updated} siparis arsive alindi.")
+    if skipped:
+        messages.warning(request, f"{skipped} siparis kapatilmadigi icin arsive alinmadi.")
+    return redirect("orders_home")
+
+
+@login_required
+async def order_export(request):
+    export_format = request.GET.get("format", "csv")
+    if export_format not in EXPORT_CONTENT_TYPES:
+        return HttpResponseBadRequest("Unsupported format")
+
+    user = await request.auser()
+    rows = order_export_rows(user).aiterator(chunk_size=EXPORT_QUERY_CHUNK_SIZE)
+    return streaming_export_response(
+        export_format,
+        "orders",
+        aexport_chunks(export_format, ORDER_EXPORT_FIELDS, rows),
+    )
+
+
+@login_required
+def order_lookup(request):
+    etsy_order_id = request.GET.get("etsy_order_id", "")
+    if not etsy_order_id.isdigit():
+        return HttpResponseBadRequest("etsy_order_id is required")
+
+    source, order = find_order(request.user, int(etsy_order_id))
+    if not order:
+        return JsonResponse({"error": "not found"}, status=404)
+    return JsonResponse({"source": source, "order": order})
+
+
+@csrf_exempt
+@require_POST
+def shipentegra_webhook(request):
+    signature = request.headers.get(WEBHOOK_SIGNATURE_HEADER, "")
+    if not verify_webhook_signature(request.body, signature):
+        return HttpResponseForbidden("Invalid signature")
+
+    try:
+        payload = json.loads(request.body)
+    except ValueError:
+        return HttpResponseBadRequest("Invalid JSON")
+
+    # Tek bir olay, {"data": {...}} zarfi veya {"events": [...]} listesi kabul edilir.
+    if isinstance(payload, dict) and "events" in payload:
+        events = payload.get("events") or []
+    elif isinstance(payload, dict) and isinstance(payload.get("data"), dict):
+        events = [payload["data"]]
+    else:
+        events = [payload]
+    if not isinstance(events, list):
+        return HttpResponseBadRequest("Invalid events")
+
+    try:
+        accepted, duplicates = enqueue_tracking_updates(events)
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    return JsonResponse({"accepted": accepted, "duplicates": duplicates}, status=202)
+
+
+# Sayilar saate gore degistigi icin conditional_page kullanilmaz.
+@login_required
+@gzip_page
+def due_to_ship(request):
+    now, _, end_of_week = due_windows()
+    rows = list(due_orders(request.user, until=end_of_week, limit=DUE_LIST_LIMIT))
+    for row in rows:
+        row["bucket"] = due_bucket(row["expected_ship_date"], now)
+    stuck = list(stuck_in_transit(request.user, STUCK_IN_TRANSIT_DAYS)[:DUE_LIST_LIMIT])
+    return render(
+        request,
+        "orders/due.html",
+        {
+            "counts": due_counts(request.user, now),
+            "due_orders": rows,
+            "limit": DUE_LIST_LIMIT,
+            "stuck_shipments": stuck,
+            "stuck_days": STUCK_IN_TRANSIT_DAYS,
+        },
+    )
+
+
+@gzip_page
+@conditional_page("orders", "listings")
+def dashboard(request):
+    context = {}
+    if request.user.is_authenticated:
+        today = timezone.localdate()
+        since = today - timezone.timedelta(days=DASHBOARD_DAYS - 1)
+        order_rollups = DailyOrderRollup.objects.filter(owner=request.user, day__gte=since)
+
+        context["kpi_today"] = order_rollups.filter(day=today).aggregate(
+            orders=Sum("orders"),
+        )
+        context["kpi_revenue"] = list(
+            order_rollups.values("currency")
+            .annotate(orders=Sum("orders"), revenue=Sum("revenue"))
+            .order_by("-revenue")
+        )
+        context["kpi_totals"] = order_rollups.aggregate(
+            orders=Sum("orders"),
+            late_shipments=Sum("late_shipments"),
+        )
+        context["kpi_days"] = list(
+            order_rollups.values("day")
+            .annotate(orders=Sum("orders"), late_shipments=Sum("late_shipments"))
+            .order_by("-day")
+        )
+
+        top_listings = list(
+            DailyListingRollup.objects.filter(owner=request.user, day__gte=since)
+            .values("etsy_listing_id")
+            .annotate(units=Sum("units"))
+            .order_by("-units")[:5]
+        )
+        titles = dict(
+            Listing.objects.filter(
+                owner=request.user,
+                etsy_listing_id__in=[row["etsy_listing_id"] for row in top_listings],
+            ).values_list("etsy_listing_id", "title")
+        )
+        for row in top_listings:
+            row["title"] = titles.get(row["etsy_listing_id"], "")
+        context["kpi_listings"] = top_listings
+        context["kpi_window_days"] = DASHBOARD_DAYS
+    return render(request, "dashboard.html", context)
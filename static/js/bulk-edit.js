@@ -0,0 +1,20 @@
+(function () {
+    var form = document.querySelector("[data-bulk-grid]");
+    if (!form) {
+        return;
+    }
+
+    // Sadece degistirilen hucreler gonderilir; dokunulmayan input'lar POST'a girmez.
+    form.addEventListener("submit", function () {
+        form.querySelectorAll("input[type=number]").forEach(function (input) {
+            input.disabled = input.value === input.defaultValue;
+        });
+    });
+
+    // Geri tusuyla donulurse disabled kalan input'lar tekrar acilir.
+    window.addEventListener("pageshow", function () {
+        form.querySelectorAll("input[type=number]").forEach(function (input) {
+            input.disabled = false;
+        });
+    });
+})();
@@ -0,0 +1,52 @@
+(function () {
+    var sentinel = document.getElementById("order-cards-sentinel");
+    var list = document.getElementById("order-cards");
+    if (!sentinel || !list || !("IntersectionObserver" in window)) {
+        return;
+    }
+
+    var loading = false;
+
+    function loadNextPage(observer) {
+        var cursor = sentinel.dataset.cursor;
+        if (loading || !cursor) {
+            return;
+        }
+        loading = true;
+
+        var url = sentinel.dataset.url + "?cursor=" + encodeURIComponent(cursor);
+        fetch(url, { credentials: "same-origin", headers: { "Accept": "application/json" } })
+            .then(function (response) {
+                if (!response.ok) {
+                    throw new Error(response.status);
+                }
+                return response.json();
+            })
+            .then(function (data) {
+                list.insertAdjacentHTML("beforeend", data.html);
+                if (data.next_cursor) {
+                    sentinel.dataset.cursor = data.next_cursor;
+                    // Sentinel hala gorunurse observer tekrar tetiklensin.
+                    observer.unobserve(sentinel);
+                    observer.observe(sentinel);
+                } else {
+                    observer.disconnect();
+                    sentinel.remove();
+                }
+            })
+            .catch(function () {
+                sentinel.textContent = "Siparisler yuklenemedi.";
+                observer.disconnect();
+            })
+            .finally(function () {
+                loading = false;
+            });
+    }
+
+    var observer = new IntersectionObserver(function (entries) {
+        if (entries.some(function (entry) { return entry.isIntersecting; })) {
+            loadNextPage(observer);
+        }
+    }, { rootMargin: "400px" });
+    observer.observe(sentinel);
+})();
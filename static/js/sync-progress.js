@@ -0,0 +1,77 @@
+(function () {
+    if (!window.EventSource || !window.fetch) {
+        return;
+    }
+
+    function describe(state) {
+        var text = state.pages + " sayfa, " + state.records + " kayit";
+        if (state.tracking_lookups) {
+            text += ", " + state.tracking_lookups + " kargo sorgusu";
+        }
+        if (state.errors) {
+            text += ", " + state.errors + " hata";
+        }
+        if (state.status === "error" && state.message) {
+            text += " - " + state.message;
+        }
+        return text;
+    }
+
+    document.querySelectorAll("form[data-sync-progress]").forEach(function (form) {
+        form.addEventListener("submit", function (event) {
+            event.preventDefault();
+
+            var run = Date.now().toString(36) + Math.random().toString(36).slice(2);
+            var button = form.querySelector("button");
+            var status = document.createElement("span");
+            status.className = "small text-muted";
+            status.textContent = "Senkron basliyor...";
+            form.insertAdjacentElement("beforebegin", status);
+            if (button) {
+                button.disabled = true;
+            }
+
+            function watch(runId, done) {
+                var source = new EventSource(form.dataset.syncProgress + "?run=" + encodeURIComponent(runId));
+                source.onmessage = function (message) {
+                    var state = JSON.parse(message.data);
+                    status.textContent = describe(state);
+                    if (state.status !== "running") {
+                        source.close();
+                        if (done) {
+                            done();
+                        }
+                    }
+                };
+                return source;
+            }
+
+            var source = watch(run);
+            var data = new FormData(form);
+            data.append("run", run);
+            fetch(form.action, {
+                method: "POST",
+                body: data,
+                credentials: "same-origin",
+                headers: { Accept: "application/json" }
+            })
+                .then(function (response) {
+                    if (response.status !== 409) {
+                        return null;
+                    }
+                    // Ayni hesapta calisan sync'e baglan; bitince sayfayi yenile.
+                    return response.json().then(function (running) {
+                        source.close();
+                        status.textContent = "Senkron zaten calisiyor, ilerleme izleniyor...";
+                        return new Promise(function (resolve) {
+                            source = watch(running.run, resolve);
+                        });
+                    });
+                })
+                .finally(function () {
+                    source.close();
+                    window.location.reload();
+                });
+        });
+    });
+})();